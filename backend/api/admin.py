@@ -1,3 +1,23 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import PredictionJob, TickerAccuracy, TickerInfo
+
+
+@admin.register(PredictionJob)
+class PredictionJobAdmin(admin.ModelAdmin):
+    list_display = ("ticker", "trading_day", "status", "created_at", "finished_at")
+    list_filter = ("status", "trading_day")
+    search_fields = ("ticker",)
+
+
+@admin.register(TickerInfo)
+class TickerInfoAdmin(admin.ModelAdmin):
+    list_display = ("ticker", "long_name", "fetched_at")
+    search_fields = ("ticker", "long_name")
+
+
+@admin.register(TickerAccuracy)
+class TickerAccuracyAdmin(admin.ModelAdmin):
+    list_display = ("ticker", "rmse", "r2", "as_of", "model_hash", "evaluated_at")
+    list_filter = ("model_hash",)
+    search_fields = ("ticker",)
@@ -0,0 +1,125 @@
+# api/backtest.py
+import math
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(scaled: np.ndarray, seq_length: int) -> np.ndarray:
+    """
+    All ``(seq_length, 1)`` input windows over ``scaled`` as one strided view.
+
+    Window ``i`` covers ``scaled[i : i + seq_length]`` and predicts
+    ``scaled[i + seq_length]``, so the last point is never an input.
+    Nothing is copied: the result shares memory with ``scaled``. Raises
+    ValueError unless there is at least one window plus its target.
+    """
+    series = np.ascontiguousarray(scaled, dtype="float32").ravel()
+    if len(series) <= seq_length:
+        raise ValueError(f"Not enough data to form sequence of {seq_length} days.")
+    windows = sliding_window_view(series[:-1], seq_length)
+    return windows[..., np.newaxis]
+
+
+class RunningMetrics:
+    """
+    MSE / RMSE / R² accumulated chunk by chunk.
+
+    Uses Welford's update for the variance of the actual values so R² is
+    numerically stable without keeping the full series around.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sse = 0.0  # sum of squared errors
+        self.mean = 0.0  # running mean of actual values
+        self.m2 = 0.0  # sum of squared deviations from the mean
+
+    def update(self, actual: np.ndarray, predicted: np.ndarray):
+        actual = np.asarray(actual, dtype="f8")
+        predicted = np.asarray(predicted, dtype="f8")
+        n = actual.size
+        if not n:
+            return
+
+        self.sse += float(np.sum((actual - predicted) ** 2))
+
+        # Chan et al. parallel combination of (count, mean, M2)
+        chunk_mean = float(actual.mean())
+        chunk_m2 = float(np.sum((actual - chunk_mean) ** 2))
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def mse(self) -> float:
+        return self.sse / self.count if self.count else math.nan
+
+    @property
+    def rmse(self) -> float:
+        return math.sqrt(self.mse)
+
+    @property
+    def r2(self) -> float:
+        return 1.0 - self.sse / self.m2 if self.m2 else math.nan
+
+    def as_dict(self, digits=4) -> dict:
+        # NaN isn't valid JSON (job results, API responses): R² of a flat
+        # series is reported as None
+        r2 = self.r2
+        return {
+            "mse": round(self.mse, digits),
+            "rmse": round(self.rmse, digits),
+            "r2": None if math.isnan(r2) else round(r2, digits),
+        }
+
+
+@dataclass
+class BacktestResult:
+    actual: np.ndarray  # prices, float32, one per predicted day
+    predicted: np.ndarray  # prices, float32
+    metrics: RunningMetrics
+
+
+def iter_predictions(model, scaled, scaler, seq_length, chunk_size=None):
+    """
+    Yield ``(offset, actual_prices, predicted_prices)`` per chunk of windows.
+
+    Only one chunk of inputs is materialised at a time, so peak memory does
+    not grow with the length of the history.
+    """
+    chunk_size = chunk_size or settings.ML_BACKTEST_CHUNK_SIZE
+    windows = sliding_windows(scaled, seq_length)
+    targets = np.asarray(scaled, dtype="float32").ravel()[seq_length:]
+
+    for offset in range(0, len(windows), chunk_size):
+        batch = windows[offset : offset + chunk_size]
+        predicted_scaled = np.asarray(model.predict_on_batch(batch)).reshape(-1, 1)
+        actual_scaled = targets[offset : offset + len(batch)].reshape(-1, 1)
+        yield (
+            offset,
+            scaler.inverse_transform(actual_scaled).ravel(),
+            scaler.inverse_transform(predicted_scaled).ravel(),
+        )
+
+
+def run_backtest(model, scaled, scaler, seq_length, chunk_size=None) -> BacktestResult:
+    """Walk the whole history once, keeping only the predicted series."""
+    count = max(len(scaled) - seq_length, 0)
+    actual = np.empty(count, dtype="float32")
+    predicted = np.empty(count, dtype="float32")
+    metrics = RunningMetrics()
+
+    for offset, actual_chunk, predicted_chunk in iter_predictions(
+        model, scaled, scaler, seq_length, chunk_size
+    ):
+        end = offset + len(actual_chunk)
+        actual[offset:end] = actual_chunk
+        predicted[offset:end] = predicted_chunk
+        metrics.update(actual_chunk, predicted_chunk)
+
+    return BacktestResult(actual=actual, predicted=predicted, metrics=metrics)
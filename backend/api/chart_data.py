@@ -0,0 +1,93 @@
+# api/chart_data.py
+import numpy as np
+
+# Column order of the binary payload (after the int32 day numbers)
+BINARY_COLUMNS = ["actual", "predicted", "residual"]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of ``threshold`` points that keep the visual shape
+    of ``y`` over ``x`` (peaks and troughs survive, flat runs collapse).
+    First and last points are always kept.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="f8")
+    y = np.asarray(y, dtype="f8")
+    every = (n - 2) / (threshold - 2)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the *next* bucket is the third corner of the triangle
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def chart_series(series: dict, start=None, end=None, points=None) -> dict:
+    """
+    Slice a persisted prediction series to ``[start, end]`` and optionally
+    downsample it to ``points`` points (LTTB on the actual prices; the same
+    indices are applied to every column so they stay aligned).
+    """
+    dates = series["dates"]
+    lo = np.searchsorted(dates, np.datetime64(start, "D")) if start else 0
+    hi = (
+        np.searchsorted(dates, np.datetime64(end, "D"), side="right")
+        if end
+        else len(dates)
+    )
+
+    dates = dates[lo:hi]
+    actual = series["actual"][lo:hi]
+    predicted = series["predicted"][lo:hi]
+
+    if points:
+        keep = lttb_indices(dates.astype("f8"), actual, points)
+        dates, actual, predicted = dates[keep], actual[keep], predicted[keep]
+
+    return {
+        "dates": dates,
+        "actual": actual,
+        "predicted": predicted,
+        "residual": actual - predicted,
+    }
+
+
+def to_json(columns: dict, digits=4) -> dict:
+    return {
+        "count": len(columns["dates"]),
+        "dates": np.datetime_as_string(columns["dates"], unit="D").tolist(),
+        **{
+            name: np.round(columns[name].astype("f8"), digits).tolist()
+            for name in BINARY_COLUMNS
+        },
+    }
+
+
+def to_binary(columns: dict) -> bytes:
+    """
+    Little-endian columnar payload: ``count`` int32 day numbers (days since
+    1970-01-01), then ``count`` float32 values for each of BINARY_COLUMNS.
+    """
+    parts = [columns["dates"].astype("datetime64[D]").astype("<i4")]
+    parts += [columns[name].astype("<f4") for name in BINARY_COLUMNS]
+    return b"".join(part.tobytes() for part in parts)
@@ -0,0 +1,23 @@
+# api/files.py
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write(path, write):
+    """
+    Write a file so readers only ever see the old or the complete new version.
+
+    ``write`` receives a binary file object for a temp file in the same
+    directory, which is then renamed over ``path``.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -0,0 +1,138 @@
+# api/forecast.py
+import threading
+import weakref
+
+import numpy as np
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class LSTMStepper:
+    """
+    NumPy forward pass of a stacked-LSTM + Dense model that keeps its
+    recurrent state between timesteps.
+
+    A recursive forecast then costs one cell step per extra day: the window
+    is consumed once, and each prediction is fed back as the next input from
+    the saved (h, c) states instead of re-running a whole shifted window.
+    The network therefore sees the window followed by its own forecasts; it
+    never drops the oldest bar the way a fresh fixed-length window would
+    (see ``recursive_forecast``).
+    """
+
+    def __init__(self, lstm_weights, dense_weights):
+        self.lstm_weights = lstm_weights  # [(kernel, recurrent_kernel, bias)]
+        self.dense_weights = dense_weights  # [(kernel, bias)]
+
+    @classmethod
+    def from_keras(cls, model):
+        """Weights of a supported Keras model, or None for anything else."""
+        lstm_weights, dense_weights = [], []
+        for layer in getattr(model, "layers", None) or []:
+            kind = type(layer).__name__
+            config = layer.get_config()
+            if kind == "InputLayer":
+                continue
+            if (
+                kind == "LSTM"
+                and not dense_weights
+                and config["activation"] == "tanh"
+                and config["recurrent_activation"] == "sigmoid"
+                and config["use_bias"]
+                and not config.get("go_backwards")
+            ):
+                lstm_weights.append(tuple(w.astype("f8") for w in layer.get_weights()))
+            elif kind == "Dense" and config["activation"] == "linear":
+                kernel, bias = layer.get_weights()
+                dense_weights.append((kernel.astype("f8"), bias.astype("f8")))
+            else:
+                return None
+        if not lstm_weights:
+            return None
+        return cls(lstm_weights, dense_weights)
+
+    def initial_states(self, batch_size):
+        return [
+            (np.zeros((batch_size, len(u))), np.zeros((batch_size, len(u))))
+            for _, u, _ in self.lstm_weights
+        ]
+
+    def step(self, x_t, states):
+        """One timestep: ``x_t`` is ``(batch, features)``; returns (y, states)."""
+        h_in, new_states = x_t, []
+        for (kernel, recurrent, bias), (h, c) in zip(self.lstm_weights, states):
+            z = h_in @ kernel + h @ recurrent + bias
+            i, f, g, o = np.split(z, 4, axis=1)  # Keras gate order
+            c = _sigmoid(f) * c + _sigmoid(i) * np.tanh(g)
+            h = _sigmoid(o) * np.tanh(c)
+            new_states.append((h, c))
+            h_in = h
+        y = h_in
+        for kernel, bias in self.dense_weights:
+            y = y @ kernel + bias
+        return y, new_states
+
+    def consume(self, windows):
+        """Run ``(batch, seq, features)`` windows; returns (last y, states)."""
+        windows = np.asarray(windows, dtype="f8")
+        states = self.initial_states(len(windows))
+        for t in range(windows.shape[1]):
+            y, states = self.step(windows[:, t], states)
+        return y, states
+
+    def predict(self, windows) -> np.ndarray:
+        """What ``model.predict(windows)`` returns, ``(batch, outputs)``."""
+        return self.consume(windows)[0]
+
+    def forecast(self, windows, horizon) -> np.ndarray:
+        """``windows`` is ``(batch, seq, features)``; returns ``(batch, horizon)``."""
+        y, states = self.consume(windows)
+        out = np.empty((len(windows), horizon))
+        out[:, 0] = y[:, 0]
+        for k in range(1, horizon):
+            y, states = self.step(y, states)
+            out[:, k] = y[:, 0]
+        return out
+
+
+_steppers = weakref.WeakKeyDictionary()  # model -> LSTMStepper | None
+_steppers_lock = threading.Lock()
+
+
+def stepper_for(model):
+    """Cached stepper for ``model`` (dropped with the model on reload)."""
+    with _steppers_lock:
+        if model not in _steppers:
+            _steppers[model] = LSTMStepper.from_keras(model)
+        return _steppers[model]
+
+
+def recursive_forecast(model, windows, horizon) -> np.ndarray:
+    """
+    ``horizon`` scaled predictions per window, each fed back as the next
+    input.
+
+    Keras LSTMs are stepped cell by cell: ``seq + horizon`` steps, with the
+    network seeing the window followed by its own forecasts. Other runtimes
+    (TFLite, the inference server) only take fixed-length windows, so they
+    fall back to one batched full-window pass per day, sliding the window.
+    Both agree on the first day; later days differ slightly between the two
+    because the stepper keeps the oldest bars in context.
+    """
+    windows = np.asarray(windows, dtype="float32")
+    stepper = stepper_for(model)
+    if stepper is not None:
+        return stepper.forecast(windows, horizon)
+
+    out = np.empty((len(windows), horizon))
+    for k in range(horizon):
+        predicted = np.asarray(
+            model.predict(windows, batch_size=len(windows), verbose=0)
+        )
+        out[:, k] = predicted.reshape(len(windows), -1)[:, 0]
+        windows = np.concatenate(
+            [windows[:, 1:], predicted.reshape(len(windows), 1, 1)], axis=1
+        ).astype("float32")
+    return out
@@ -0,0 +1,186 @@
+# api/inference.py
+import logging
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# --- Wire format (one request/response pair at a time per connection) ---
+# request:  <III rows, steps, features> then rows*steps*features float32
+# response: <BI status, count> then `count` float32 outputs (status 0)
+#           or `count` bytes of utf-8 error text (status 1)
+_REQUEST = struct.Struct("<III")
+_RESPONSE = struct.Struct("<BI")
+
+
+def _recv_exact(sock, size) -> bytearray:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if not n:
+            raise ConnectionError("Inference socket closed")
+        received += n
+    return buffer
+
+
+class RemoteModel:
+    """
+    Client side of ``manage.py serve_model``, with the ``predict`` calls the
+    views make on a Keras model. Each thread keeps its own connection; a
+    connection that errors is dropped and reopened on the next call.
+    """
+
+    def __init__(self, path, timeout=None):
+        self.path = str(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            self._local.sock = sock
+        return sock
+
+    def predict_on_batch(self, x) -> np.ndarray:
+        x = np.ascontiguousarray(x, dtype="<f4")
+        sock = self._connection()
+        try:
+            sock.sendall(_REQUEST.pack(*x.shape))
+            sock.sendall(x.data)
+            status, count = _RESPONSE.unpack(_recv_exact(sock, _RESPONSE.size))
+            payload = _recv_exact(sock, count if status else count * 4)
+        except OSError:
+            sock.close()
+            self._local.sock = None
+            raise
+        if status:
+            raise RuntimeError(payload.decode())
+        return np.frombuffer(payload, dtype="<f4").reshape(len(x), -1)
+
+    def predict(self, x, batch_size=None, verbose=0) -> np.ndarray:
+        # The server does the batching
+        return self.predict_on_batch(x)
+
+
+class MicroBatcher:
+    """
+    Runs concurrent requests as one ``predict_on_batch``.
+
+    The first queued request opens a window of ``window`` seconds; every
+    request that arrives before it closes (up to ``max_rows`` windows in
+    total) is concatenated into the same batch and the outputs are split
+    back out per request.
+    """
+
+    def __init__(self, get_model, window, max_rows):
+        self.get_model = get_model
+        self.window = window
+        self.max_rows = max_rows
+        self._queue = queue.Queue()
+
+    def submit(self, x) -> np.ndarray:
+        future = Future()
+        self._queue.put((x, future))
+        return future.result()
+
+    def serve_forever(self):
+        while True:
+            batch = [self._queue.get()]
+            rows = len(batch[0][0])
+            deadline = time.monotonic() + self.window
+            while rows < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                rows += len(item[0])
+            self._run(batch)
+
+    def _run(self, batch):
+        # Windows of different shapes can't share a tensor
+        groups = {}
+        for item in batch:
+            groups.setdefault(item[0].shape[1:], []).append(item)
+        for group in groups.values():
+            self._run_group(group)
+
+    def _run_group(self, batch):
+        try:
+            inputs = np.concatenate([x for x, _ in batch])
+            outputs = np.asarray(self.get_model().predict_on_batch(inputs))
+        except Exception as e:
+            logger.exception("Batch of %d requests failed", len(batch))
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        offset = 0
+        for x, future in batch:
+            future.set_result(outputs[offset : offset + len(x)])
+            offset += len(x)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        sock = self.request
+        while True:
+            try:
+                shape = _REQUEST.unpack(_recv_exact(sock, _REQUEST.size))
+                data = _recv_exact(sock, 4 * shape[0] * shape[1] * shape[2])
+            except ConnectionError:
+                return
+            x = np.frombuffer(data, dtype="<f4").reshape(shape)
+
+            try:
+                y = np.ascontiguousarray(self.server.batcher.submit(x), dtype="<f4")
+            except Exception as e:
+                # The client only gets the message; keep the traceback here
+                logger.exception("Inference request of shape %s failed", shape)
+                message = str(e).encode()
+                sock.sendall(_RESPONSE.pack(1, len(message)) + message)
+                continue
+            sock.sendall(_RESPONSE.pack(0, y.size))
+            sock.sendall(y.data)
+
+
+class InferenceServer(socketserver.ThreadingUnixStreamServer):
+    """One thread per client connection, one batcher thread owning the model."""
+
+    daemon_threads = True
+    request_queue_size = 128  # every web worker thread may connect at once
+
+    def __init__(self, path, batcher):
+        if os.path.exists(path):
+            os.unlink(path)  # left behind by a previous run
+        super().__init__(str(path), _Handler)
+        self.batcher = batcher
+        threading.Thread(
+            target=batcher.serve_forever, name="micro-batcher", daemon=True
+        ).start()
+
+
+def configure_tf_threads(intra_op, inter_op):
+    """Must run before TensorFlow executes anything; 0 keeps TF's default."""
+    import tensorflow as tf
+
+    if intra_op:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+    if inter_op:
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op)
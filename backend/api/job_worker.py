@@ -0,0 +1,63 @@
+# api/job_worker.py
+"""
+Code that runs inside the prediction pool processes.
+
+Deliberately free of module-level Django imports: a "spawn" child unpickles
+the task (importing this module) before the initializer has run
+``django.setup()``.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def init_worker():
+    # DJANGO_SETTINGS_MODULE is inherited from the parent's environment
+    import django
+
+    django.setup()
+
+
+def run_job(job_id: str):
+    from django.db import close_old_connections
+    from django.utils import timezone
+
+    from .jobs import finish_job
+    from .ml_utils import perform_prediction
+    from .models import PredictionJob
+
+    close_old_connections()
+    job = PredictionJob.objects.get(pk=job_id)
+    started = PredictionJob.objects.filter(pk=job_id, status="pending").update(
+        status="running", started_at=timezone.now()
+    )
+    if not started:
+        return  # timed out while queued (see fail_overdue_jobs)
+
+    try:
+        result = perform_prediction(job.ticker)
+    except Exception as e:
+        logger.exception("Prediction job %s failed", job_id)
+        finish_job(job_id, "failed", error=str(e))
+    else:
+        finish_job(job_id, "succeeded", result=result)
+    finally:
+        close_old_connections()
+
+
+def evaluate_ticker(ticker: str, years: int) -> dict:
+    """Backtest one ticker for ``manage.py evaluate_universe``."""
+    from .ml_utils import perform_prediction
+    from .model_registry import registry
+    from .plots import load_series
+
+    result = perform_prediction(ticker, years)
+    as_of = load_series(result["run_id"])["dates"][-1]
+    return {
+        "ticker": result["ticker"],
+        "model_hash": registry.model_hash(),
+        "as_of": str(as_of),
+        "years": years,
+        **result["metrics"],
+    }
@@ -0,0 +1,110 @@
+# api/jobs.py
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .job_worker import init_worker, run_job
+from .models import ACTIVE_JOB_STATUSES, PredictionJob
+from .price_store import latest_trading_day
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Per-process pool that runs predictions outside the request worker.
+
+    Uses "spawn" rather than fork: forking a process that already imported
+    TensorFlow is not safe.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.ML_JOB_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+            )
+        return _executor
+
+
+def submit_prediction(ticker: str) -> tuple[PredictionJob, bool]:
+    """
+    Queue ``perform_prediction(ticker)`` unless the same ticker is already
+    being computed for the current trading day.
+
+    Returns ``(job, created)``; ``created`` is False when the caller was
+    attached to an in-flight job.
+    """
+    trading_day = latest_trading_day()
+
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                job = PredictionJob.objects.create(
+                    ticker=ticker, trading_day=trading_day
+                )
+        except IntegrityError:
+            job = _active_job(ticker, trading_day)
+            if job is not None:
+                return job, False
+            # The in-flight job finished between our insert and lookup
+            continue
+
+        transaction.on_commit(partial(_dispatch, str(job.pk)))
+        return job, True
+
+    raise RuntimeError(f"Could not queue prediction job for {ticker}")
+
+
+def _active_job(ticker, trading_day):
+    fail_overdue_jobs(ticker=ticker, trading_day=trading_day)
+    return PredictionJob.objects.filter(
+        ticker=ticker, trading_day=trading_day, status__in=ACTIVE_JOB_STATUSES
+    ).first()
+
+
+def fail_overdue_jobs(**filters) -> int:
+    """
+    Mark pending/running jobs older than ML_JOB_TIMEOUT_SECONDS as failed.
+
+    Their worker died mid-job or the web process restarted with the job
+    still queued; left alone they'd block the ticker all day and keep
+    pollers waiting. ``filters`` narrow the jobs looked at.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.ML_JOB_TIMEOUT_SECONDS)
+    return PredictionJob.objects.filter(
+        status__in=ACTIVE_JOB_STATUSES, created_at__lt=cutoff, **filters
+    ).update(status="failed", error="Timed out", finished_at=timezone.now())
+
+
+def finish_job(job_id, status, result=None, error=""):
+    PredictionJob.objects.filter(pk=job_id, status__in=ACTIVE_JOB_STATUSES).update(
+        status=status, result=result, error=error, finished_at=timezone.now()
+    )
+
+
+def _dispatch(job_id: str):
+    future = get_executor().submit(run_job, job_id)
+    future.add_done_callback(partial(_on_done, job_id))
+
+
+def _on_done(job_id, future):
+    # run_job records its own failures; this only sees crashed pool processes
+    exc = future.exception()
+    if exc is None:
+        return
+
+    global _executor
+    if isinstance(exc, BrokenProcessPool):
+        with _executor_lock:
+            _executor = None  # start a fresh pool on the next submission
+    finish_job(job_id, "failed", error=str(exc))
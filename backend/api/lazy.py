@@ -0,0 +1,38 @@
+# api/lazy.py
+from django.utils.module_loading import import_string
+
+
+def lazy_view(dotted_path, csrf_exempt=True, is_async=False):
+    """
+    URLconf entry for a view whose module is only imported on first request.
+
+    ``dotted_path`` names a view function or a class-based view (``as_view()``
+    is called for classes). ``csrf_exempt`` has to be decided up front, since
+    CsrfViewMiddleware looks at the view before it is loaded; DRF APIViews
+    are exempt anyway and enforce CSRF themselves for session auth.
+    Likewise ``is_async`` must be set for ``async def`` views, since Django
+    decides how to call a view from the URLconf entry.
+    """
+    resolved = None
+
+    def resolve():
+        nonlocal resolved
+        if resolved is None:
+            target = import_string(dotted_path)
+            resolved = target.as_view() if isinstance(target, type) else target
+        return resolved
+
+    if is_async:
+
+        async def view(request, *args, **kwargs):
+            return await resolve()(request, *args, **kwargs)
+
+    else:
+
+        def view(request, *args, **kwargs):
+            return resolve()(request, *args, **kwargs)
+
+    view.__name__ = view.__qualname__ = dotted_path.rsplit(".", 1)[-1]
+    view.__module__ = dotted_path.rsplit(".", 1)[0]
+    view.csrf_exempt = csrf_exempt
+    return view
@@ -0,0 +1,124 @@
+# api/lite.py
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Reduced-precision variants written by ``manage.py convert_model``
+VARIANTS = ["float32", "float16", "int8"]
+
+
+def variant_path(model_path, variant) -> Path:
+    """``stock_prediction_model.keras`` -> ``stock_prediction_model.int8.tflite``"""
+    model_path = Path(model_path)
+    return model_path.with_name(f"{model_path.stem}.{variant}.tflite")
+
+
+def convert(keras_model, variant) -> bytes:
+    """
+    Convert a Keras model to a TFLite flatbuffer.
+
+    The model is traced at a static batch-of-one input: with a dynamic batch
+    (``from_keras_model``) the LSTM's tensor lists have no static element
+    shape and the converter gives up. ``TFLiteModel`` runs larger batches
+    window by window.
+
+    ``float16`` and ``int8`` store the weights at that precision. Inputs and
+    outputs stay float32 for every variant so callers don't change.
+    """
+    import tensorflow as tf
+
+    spec = tf.TensorSpec([1, *keras_model.input_shape[1:]], tf.float32)
+    function = tf.function(lambda x: keras_model(x, training=False))
+    # No trackable object: the weights are frozen into constants
+    converter = tf.lite.TFLiteConverter.from_concrete_functions(
+        [function.get_concrete_function(spec)]
+    )
+    if variant == "float16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif variant == "int8":
+        # Dynamic-range: int8 weights, float activations. Full-integer
+        # calibration crashes the converter on the LSTM's WHILE loop.
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif variant != "float32":
+        raise ValueError(f"Unknown variant {variant!r}; expected one of {VARIANTS}")
+    return converter.convert()
+
+
+def _interpreter_class():
+    # The standalone runtimes keep TensorFlow itself out of the worker
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class TFLiteModel:
+    """
+    A converted model behind the ``predict``/``predict_on_batch`` calls the
+    views already make on a Keras model.
+
+    The interpreter isn't thread-safe, so calls are serialised. Models from
+    ``convert`` have a fixed batch of one (their reshapes are static, so the
+    input can't be resized) and batches run window by window; models with a
+    dynamic batch dimension are resized when the batch size changes.
+    """
+
+    def __init__(self, path, num_threads=None):
+        self.path = str(path)
+        self._interpreter = _interpreter_class()(
+            model_path=self.path, num_threads=num_threads
+        )
+        self._interpreter.allocate_tensors()
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        signature = self._input.get("shape_signature", self._input["shape"])
+        self._fixed_batch = int(signature[0]) if signature[0] > 0 else None
+        self._batch_size = int(self._input["shape"][0])
+        self._lock = threading.Lock()
+
+    @property
+    def input_shape(self):
+        return (None, *(int(dim) for dim in self._input["shape"][1:]))
+
+    def predict_on_batch(self, x) -> np.ndarray:
+        x = np.ascontiguousarray(x, dtype=self._input["dtype"])
+        with self._lock:
+            if self._fixed_batch is None or not len(x):
+                return self._invoke(x)
+            step = self._fixed_batch
+            chunks = []
+            for i in range(0, len(x), step):
+                chunk = x[i : i + step]
+                if len(chunk) < step:  # pad the tail to the fixed batch
+                    padding = np.zeros((step - len(chunk), *x.shape[1:]), x.dtype)
+                    chunk = np.concatenate([chunk, padding])
+                chunks.append(self._invoke(chunk)[: len(x) - i])
+            return np.concatenate(chunks)
+
+    def _invoke(self, x) -> np.ndarray:
+        if len(x) != self._batch_size:
+            self._interpreter.resize_tensor_input(self._input["index"], x.shape)
+            self._interpreter.allocate_tensors()
+            self._batch_size = len(x)
+        self._interpreter.set_tensor(self._input["index"], x)
+        self._interpreter.invoke()
+        return self._interpreter.get_tensor(self._output["index"]).copy()
+
+    def predict(self, x, batch_size=None, verbose=0) -> np.ndarray:
+        batch_size = batch_size or 32  # Keras' default
+        if len(x) <= batch_size:
+            return self.predict_on_batch(x)
+        return np.concatenate(
+            [
+                self.predict_on_batch(x[i : i + batch_size])
+                for i in range(0, len(x), batch_size)
+            ]
+        )
@@ -0,0 +1,321 @@
+# api/management/commands/benchmark_predictions.py
+import json
+import platform
+import resource
+import statistics
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from sklearn.preprocessing import MinMaxScaler
+
+from api.backtest import RunningMetrics, iter_predictions, sliding_windows
+from api.model_registry import active_model_path, registry
+from api.next_day import predict_next_day
+from api.plots import PLOT_KINDS, render_plot
+from api.price_store import PriceStore
+from api.providers import (
+    FileProvider,
+    YFinanceProvider,
+    get_provider,
+    synthetic_close,
+)
+
+
+class PhaseTimer:
+    """
+    Wall time and peak Python heap growth per named phase.
+
+    Memory is what tracemalloc sees: the highest traced allocation during
+    the phase above what was already allocated when it started. Buffers
+    allocated outside Python's allocator (TensorFlow tensors, most native
+    libraries) aren't traced; ``max_rss_mb`` in the report covers those.
+
+    tracemalloc slows allocation-heavy code several times over, so timings
+    come from untraced passes and memory from a separate traced pass
+    (``tracing = True``) whose timings are thrown away.
+    """
+
+    def __init__(self):
+        self.seconds: dict[str, list[float]] = {}
+        self.peak_bytes: dict[str, int] = {}
+        self.tracing = False
+
+    @contextmanager
+    def phase(self, name):
+        if self.tracing:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if self.tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                grown = max(peak - baseline, 0)
+                self.peak_bytes[name] = max(self.peak_bytes.get(name, 0), grown)
+            else:
+                self.seconds.setdefault(name, []).append(elapsed)
+
+    def summary(self) -> dict:
+        return {
+            name: {
+                "median_ms": round(statistics.median(times) * 1000, 3),
+                "min_ms": round(min(times) * 1000, 3),
+                "py_heap_peak_kb": round(self.peak_bytes.get(name, 0) / 1024, 1),
+            }
+            for name, times in self.seconds.items()
+        }
+
+
+def compare(current: dict, baseline: dict, threshold, min_ms) -> list[str]:
+    """Phases slower (or hungrier) than ``baseline`` by more than ``threshold``."""
+    regressions = []
+    for name, now in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if now["median_ms"] > max(before["median_ms"] * (1 + threshold), min_ms):
+            regressions.append(
+                f"{name}: {before['median_ms']:.2f} ms -> {now['median_ms']:.2f} ms"
+            )
+        # Baselines from before the per-phase heap delta have no comparable value
+        before_kb = before.get("py_heap_peak_kb")
+        if before_kb is None:
+            continue
+        if now["py_heap_peak_kb"] > before_kb * (1 + threshold) + 64:
+            regressions.append(
+                f"{name}: {before_kb:.0f} KB -> {now['py_heap_peak_kb']:.0f} KB "
+                "Python heap peak"
+            )
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks each phase of the prediction path against recorded price "
+        "fixtures (offline) and compares with a stored baseline. On a fresh "
+        "checkout run it once with --record (or use --synthetic) and "
+        "--save-baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("tickers", nargs="*", default=["MSFT"])
+        parser.add_argument(
+            "--fixtures",
+            type=Path,
+            default=settings.ML_FIXTURES_DIR,
+            help="FileProvider directory with <TICKER>.csv/.parquet recordings.",
+        )
+        parser.add_argument(
+            "--synthetic",
+            action="store_true",
+            help="Use seeded random-walk prices instead of recorded fixtures.",
+        )
+        parser.add_argument(
+            "--record",
+            action="store_true",
+            help="Download the tickers' history from the live provider into "
+            "--fixtures first (once per machine; later runs stay offline).",
+        )
+        parser.add_argument(
+            "--years",
+            type=int,
+            default=10,
+            help="History to --record, in years.",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=settings.BASE_DIR / "benchmarks" / "baseline.json",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Write this run as the new baseline instead of comparing.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed slowdown / memory growth as a fraction (0.2 = 20%%).",
+        )
+        parser.add_argument(
+            "--min-ms",
+            type=float,
+            default=1.0,
+            help="Ignore timing regressions in phases faster than this.",
+        )
+
+    def handle(self, *args, **options):
+        tickers = [t.upper() for t in options["tickers"]]
+        if options["record"] and options["synthetic"]:
+            raise CommandError("--record and --synthetic don't mix.")
+        if options["record"]:
+            self._record(tickers, options["fixtures"], options["years"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            fixtures = options["fixtures"]
+            if options["synthetic"]:
+                fixtures = tmp / "fixtures"
+                for seed, ticker in enumerate(tickers):
+                    FileProvider(fixtures).save(ticker, synthetic_close(seed=seed))
+
+            missing = [t for t in tickers if FileProvider(fixtures).load(t) is None]
+            if missing:
+                raise CommandError(
+                    f"No fixtures for {', '.join(missing)} in {fixtures}; record "
+                    "them with --record or pass --synthetic."
+                )
+
+            # Never touch the network or the real data directory
+            with override_settings(
+                ML_MARKET_DATA_PROVIDER="file",
+                ML_FIXTURES_DIR=fixtures,
+                ML_DATA_DIR=tmp / "data",
+                ML_PRICE_STORE_DIR=tmp / "data" / "prices",
+            ):
+                get_provider.cache_clear()
+                try:
+                    phases = self._run(tickers, fixtures, tmp, options["repeat"])
+                finally:
+                    get_provider.cache_clear()
+
+        report = {
+            "tickers": tickers,
+            "repeat": options["repeat"],
+            "model": str(active_model_path()),
+            "python": platform.python_version(),
+            "max_rss_mb": round(
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+            ),
+            "phases": phases,
+        }
+        self._print(report)
+        self._check_baseline(report, options)
+
+    def _record(self, tickers, fixtures, years):
+        provider = get_provider()
+        if isinstance(provider, FileProvider):
+            provider = YFinanceProvider()  # the fixtures can't record themselves
+        end = date.today() + timedelta(days=1)
+        closes = provider.download_closes(
+            tickers, end - timedelta(days=365 * years), end
+        )
+
+        missing = [t for t in tickers if t not in closes or closes[t].empty]
+        if missing:
+            raise CommandError(f"No prices downloaded for {', '.join(missing)}.")
+        for ticker in tickers:
+            close = closes[ticker]
+            FileProvider(fixtures).save(ticker, close)
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Recorded {len(close)} {ticker} closes")
+            )
+
+    def _run(self, tickers, fixtures, tmp, repeat) -> dict:
+        timer = PhaseTimer()
+        provider = FileProvider(fixtures)
+        starts = {t: provider.load(t).index[0].date() for t in tickers}
+
+        # Timed passes, then one traced pass for peak memory
+        for i in range(repeat):
+            self._pass(timer, tickers, starts, tmp / "data" / f"prices-{i}")
+        tracemalloc.start()
+        timer.tracing = True
+        try:
+            self._pass(timer, tickers, starts, tmp / "data" / "prices-traced")
+        finally:
+            tracemalloc.stop()
+        return timer.summary()
+
+    def _pass(self, timer, tickers, starts, store_dir):
+        seq_length = settings.ML_SEQUENCE_LENGTH
+        registry.clear()
+        with timer.phase("model_load"):
+            model = registry.get_model()
+
+        for ticker in tickers:
+            store = PriceStore(store_dir / ticker)
+            with timer.phase("data_load_cold"):
+                close = store.get_close(ticker, starts[ticker])
+            with timer.phase("data_load_warm"):
+                close = store.get_close(ticker, starts[ticker])
+
+            with timer.phase("scaling"):
+                scaler = MinMaxScaler(feature_range=(0, 1))
+                scaled = scaler.fit_transform(close.values.reshape(-1, 1))
+
+            with timer.phase("windowing"):
+                np.ascontiguousarray(sliding_windows(scaled, seq_length))
+
+            with timer.phase("inference"):
+                chunks = list(iter_predictions(model, scaled, scaler, seq_length))
+
+            with timer.phase("metrics"):
+                metrics = RunningMetrics()
+                for _, actual, predicted in chunks:
+                    metrics.update(actual, predicted)
+
+            with timer.phase("next_day"):
+                predict_next_day(model, {ticker: close.iloc[-730:]}, seq_length)
+
+            series = {
+                "ticker": ticker,
+                "dates": close.index.values[seq_length:].astype("datetime64[D]"),
+                "actual": np.concatenate([c[1] for c in chunks]),
+                "predicted": np.concatenate([c[2] for c in chunks]),
+            }
+            for kind in PLOT_KINDS:
+                with timer.phase(f"plot:{kind}"):
+                    render_plot(series, kind)
+
+    def _print(self, report):
+        self.stdout.write(
+            f"{'phase':<30}{'median ms':>12}{'min ms':>12}{'py heap KB':>12}"
+        )
+        for name, phase in report["phases"].items():
+            self.stdout.write(
+                f"{name:<30}{phase['median_ms']:>12.2f}"
+                f"{phase['min_ms']:>12.2f}{phase['py_heap_peak_kb']:>12.0f}"
+            )
+        self.stdout.write(f"max RSS: {report['max_rss_mb']} MB")
+
+    def _check_baseline(self, report, options):
+        path = options["baseline"]
+        if options["save_baseline"]:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"✅ Baseline saved to {path}"))
+            return
+
+        if not path.exists():
+            self.stdout.write(f"No baseline at {path}; run with --save-baseline.")
+            return
+
+        baseline = json.loads(path.read_text())
+        regressions = compare(
+            report["phases"],
+            baseline["phases"],
+            options["threshold"],
+            options["min_ms"],
+        )
+        if regressions:
+            raise CommandError(
+                "Performance regressions vs baseline:\n  " + "\n  ".join(regressions)
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Within {options['threshold']:.0%} of the baseline in {path}"
+            )
+        )
@@ -0,0 +1,102 @@
+# api/management/commands/convert_model.py
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from sklearn.preprocessing import MinMaxScaler
+
+from api.backtest import run_backtest, sliding_windows
+from api.files import atomic_write
+from api.lite import VARIANTS, TFLiteModel, convert, variant_path
+from api.providers import synthetic_close
+
+
+def single_latency_ms(model, window, repeat=50) -> float:
+    """Median wall time of a batch-of-one predict, after one warm-up call."""
+    x = window[np.newaxis]
+    model.predict(x, verbose=0)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        model.predict(x, verbose=0)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Converts the Keras model to TFLite variants and reports their "
+        "accuracy drift and latency against the original."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source", type=Path, default=settings.ML_MODEL_PATH, help="Keras model"
+        )
+        parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=VARIANTS)
+        parser.add_argument(
+            "--ticker",
+            help="Evaluate on this ticker's last 10 years instead of the "
+            "built-in synthetic series.",
+        )
+
+    def handle(self, *args, **options):
+        from tensorflow.keras.models import load_model
+
+        source = options["source"]
+        if not source.exists():
+            raise CommandError(f"Model file not found at {source}")
+        seq_length = settings.ML_SEQUENCE_LENGTH
+
+        # --- 1) Fixed evaluation dataset ---
+        if options["ticker"]:
+            from api.price_store import price_store
+
+            now = datetime.now()
+            start = datetime(now.year - 10, now.month, now.day)
+            close = price_store.get_close(options["ticker"].upper(), start).values
+            if len(close) <= seq_length:
+                raise CommandError(f"Not enough data for {options['ticker']}")
+        else:
+            close = synthetic_close().to_numpy()
+        scaler = MinMaxScaler(feature_range=(0, 1))
+        scaled = scaler.fit_transform(close.reshape(-1, 1))
+        windows = sliding_windows(scaled, seq_length)
+
+        # --- 2) Reference: the Keras model as served today ---
+        keras_model = load_model(source)
+        reference = run_backtest(keras_model, scaled, scaler, seq_length)
+        self._report("keras", source, reference, None, keras_model, windows)
+
+        # --- 3) Convert, reload through the interpreter, compare ---
+        for variant in options["variants"]:
+            path = variant_path(source, variant)
+            flatbuffer = convert(keras_model, variant)
+            atomic_write(path, lambda fh, data=flatbuffer: fh.write(data))
+
+            lite_model = TFLiteModel(path, num_threads=settings.ML_TFLITE_THREADS)
+            result = run_backtest(lite_model, scaled, scaler, seq_length)
+            self._report(variant, path, result, reference, lite_model, windows)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "✅ Serve a variant with ML_INFERENCE_RUNTIME=tflite "
+                "ML_TFLITE_VARIANT=<variant>."
+            )
+        )
+
+    def _report(self, name, path, result, reference, model, windows):
+        metrics = result.metrics
+        line = (
+            f"{name:>8}  {Path(path).stat().st_size / 1024:8.0f} KB  "
+            f"rmse={metrics.rmse:.4f}  r2={metrics.r2:.4f}  "
+            f"single={single_latency_ms(model, windows[-1]):.2f} ms"
+        )
+        if reference is not None:
+            drift = np.abs(result.predicted - reference.predicted)
+            line += f"  drift mean={drift.mean():.4f} max={drift.max():.4f}"
+        self.stdout.write(line)
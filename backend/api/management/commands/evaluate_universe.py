@@ -0,0 +1,80 @@
+# api/management/commands/evaluate_universe.py
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.job_worker import evaluate_ticker, init_worker
+from api.models import TickerAccuracy
+
+
+class Command(BaseCommand):
+    help = (
+        "Backtests every ticker in the universe across a process pool and "
+        "stores the metrics for the accuracy leaderboard."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "tickers",
+            nargs="*",
+            help="Defaults to ML_EVALUATION_UNIVERSE.",
+        )
+        parser.add_argument(
+            "--file", type=Path, help="Read tickers from a file, one per line."
+        )
+        parser.add_argument("--years", type=int, default=10)
+        parser.add_argument("--workers", type=int, default=settings.ML_JOB_WORKERS)
+
+    def handle(self, *args, **options):
+        tickers = [t.upper() for t in options["tickers"]]
+        if options["file"]:
+            tickers += [
+                line.strip().upper()
+                for line in options["file"].read_text().splitlines()
+                if line.strip() and not line.startswith("#")
+            ]
+        tickers = list(dict.fromkeys(tickers or settings.ML_EVALUATION_UNIVERSE))
+        if not tickers:
+            raise CommandError("No tickers to evaluate.")
+
+        # Each worker loads the model once and then works through its share
+        executor = ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        )
+        saved = failed = 0
+        with executor:
+            futures = {
+                executor.submit(evaluate_ticker, ticker, options["years"]): ticker
+                for ticker in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    row = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"❌ {ticker}: {e}")
+                    continue
+
+                TickerAccuracy.objects.update_or_create(
+                    ticker=row["ticker"],
+                    model_hash=row["model_hash"],
+                    defaults={
+                        "as_of": row["as_of"],
+                        "years": row["years"],
+                        "mse": row["mse"],
+                        "rmse": row["rmse"],
+                        "r2": row["r2"],  # None for a flat series
+                    },
+                )
+                saved += 1
+                self.stdout.write(f"{ticker}: rmse={row['rmse']} r2={row['r2']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Evaluated {saved} tickers ({failed} failed).")
+        )
@@ -0,0 +1,63 @@
+# api/management/commands/serve_model.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.inference import InferenceServer, MicroBatcher, configure_tf_threads
+from api.model_registry import active_model_path, registry
+
+
+class Command(BaseCommand):
+    help = (
+        "Serves the prediction model over a Unix socket, batching concurrent "
+        "requests. Point the web workers at it with ML_INFERENCE_SOCKET."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--socket",
+            default=settings.ML_INFERENCE_SOCKET
+            or str(settings.ML_DATA_DIR / "inference.sock"),
+        )
+        parser.add_argument(
+            "--batch-window-ms", type=int, default=settings.ML_INFERENCE_BATCH_WINDOW_MS
+        )
+        parser.add_argument(
+            "--max-batch", type=int, default=settings.ML_INFERENCE_MAX_BATCH
+        )
+        parser.add_argument(
+            "--intra-op-threads", type=int, default=settings.ML_TF_INTRA_OP_THREADS
+        )
+        parser.add_argument(
+            "--inter-op-threads", type=int, default=settings.ML_TF_INTER_OP_THREADS
+        )
+
+    def handle(self, *args, **options):
+        # --- 1) Thread pools are fixed once TensorFlow starts executing ---
+        if settings.ML_INFERENCE_RUNTIME == "keras":
+            configure_tf_threads(
+                options["intra_op_threads"], options["inter_op_threads"]
+            )
+
+        # --- 2) Load + warm up the model in this process only ---
+        try:
+            registry.get()
+        except FileNotFoundError:
+            raise CommandError(f"Model file not found at {active_model_path()}")
+
+        # --- 3) Serve; the registry still hot-reloads a replaced model file ---
+        batcher = MicroBatcher(
+            registry.get_model,
+            options["batch_window_ms"] / 1000,
+            options["max_batch"],
+        )
+        settings.ML_DATA_DIR.mkdir(parents=True, exist_ok=True)
+        with InferenceServer(options["socket"], batcher) as server:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✅ Serving {active_model_path()} on {options['socket']}"
+                )
+            )
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("api", "0001_initial"),)
+
+    operations = (
+        migrations.CreateModel(
+            name="TickerInfo",
+            fields=[
+                (
+                    "ticker",
+                    models.CharField(max_length=16, primary_key=True, serialize=False),
+                ),
+                ("long_name", models.CharField(blank=True, default="", max_length=200)),
+                ("info", models.JSONField(default=dict)),
+                ("fetched_at", models.DateTimeField()),
+            ],
+        ),
+    )
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("api", "0002_tickerinfo"),)
+
+    operations = (
+        migrations.CreateModel(
+            name="TickerAccuracy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("ticker", models.CharField(max_length=16)),
+                ("model_hash", models.CharField(max_length=64)),
+                ("as_of", models.DateField()),
+                ("years", models.PositiveSmallIntegerField()),
+                ("mse", models.FloatField()),
+                ("rmse", models.FloatField()),
+                ("r2", models.FloatField(null=True)),
+                ("evaluated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["model_hash", "rmse"],
+                        name="api_tickera_model_h_5af645_idx",
+                    ),
+                    models.Index(
+                        fields=["model_hash", "mse"],
+                        name="api_tickera_model_h_f66a8d_idx",
+                    ),
+                    models.Index(
+                        fields=["model_hash", "r2"],
+                        name="api_tickera_model_h_f58bdb_idx",
+                    ),
+                    models.Index(
+                        fields=["evaluated_at"], name="api_tickera_evaluat_67f9ac_idx"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ticker", "model_hash"), name="unique_ticker_accuracy"
+                    )
+                ],
+            },
+        ),
+    )
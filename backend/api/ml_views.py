@@ -0,0 +1,417 @@
+# api/ml_views.py
+"""
+Stock prediction endpoints.
+
+Kept out of ``api.views`` and only imported when one of these routes is
+first hit (see ``api.lazy``), so workers serving CRUD traffic never load
+TensorFlow, pandas, scikit-learn or matplotlib.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .chart_data import BINARY_COLUMNS, chart_series, to_binary, to_json
+from .jobs import fail_overdue_jobs, submit_prediction
+from .ml_utils import perform_prediction
+from .model_registry import active_model_path, get_model
+from .models import PredictionJob
+from .next_day import (
+    history_start,
+    next_day_prediction,
+    predict_from_state,
+    predict_next_day,
+    refresh_state,
+)
+from .plot_store import plot_store
+from .plots import PLOT_KINDS, get_plot, load_series, series_path
+from .price_store import latest_trading_day, price_store
+from .serializers import (
+    ForecastQuerySerializer,
+    PredictionJobSerializer,
+    SeriesQuerySerializer,
+    TickerListSerializer,
+    TickerSerializer,
+)
+from .streaming import event_stream_response
+from .ticker_info import company_name
+from .timing import phase
+
+logger = logging.getLogger(__name__)
+
+warnings.filterwarnings("ignore")
+
+
+def prediction_response(request, result):
+    """
+    Public shape of a ``perform_prediction`` result. Plot URLs point at
+    ``prediction_plot``, which draws each plot the first time it is fetched.
+    """
+    plot_urls = {
+        f"{kind}_url": request.build_absolute_uri(
+            reverse("prediction-plot", args=[result["run_id"], kind])
+        )
+        for kind in PLOT_KINDS
+    }
+    return {
+        "metrics": result["metrics"],
+        "plots": plot_urls,
+        "series_url": request.build_absolute_uri(
+            reverse("prediction-series", args=[result["run_id"]])
+        ),
+    }
+
+
+def _plot_etag(request, run_id, kind):
+    # No ETag for runs we can't serve, so If-None-Match can't turn a 404 into 304
+    if plot_store.get(run_id, kind) is None and not series_path(run_id).exists():
+        return None
+    return f"{run_id}-{kind}"
+
+
+@etag(_plot_etag)
+@cache_control(public=True, max_age=7 * 24 * 60 * 60)
+def prediction_plot(request, run_id, kind):
+    """
+    PNG for one plot of a prediction run. Run ids are content-addressed, so
+    the bytes behind a URL never change and the id doubles as the ETag.
+    """
+    try:
+        with phase("plot"):
+            path = get_plot(run_id, kind)
+        return plot_file_response(path)
+    except (KeyError, FileNotFoundError):
+        raise Http404("Unknown plot")
+
+
+def plot_file_response(path):
+    """Stream ``path`` ourselves or hand it to the proxy (ML_PLOT_SENDFILE)."""
+    mode = settings.ML_PLOT_SENDFILE
+    if mode == "x-accel-redirect":
+        response = HttpResponse(content_type="image/png")
+        relative = path.relative_to(plot_store.root).as_posix()
+        response["X-Accel-Redirect"] = settings.ML_PLOT_ACCEL_PREFIX + relative
+        return response
+    if mode == "x-sendfile":
+        response = HttpResponse(content_type="image/png")
+        response["X-Sendfile"] = str(path)
+        return response
+    return FileResponse(open(path, "rb"), content_type="image/png")
+
+
+class PredictionSeriesView(APIView):
+    """
+    Actual / predicted / residual series of a prediction run, for drawing
+    charts client-side instead of fetching server-rendered PNGs.
+
+    ``?start=&end=`` slice by date, ``?points=N`` downsamples with LTTB and
+    ``?payload=binary`` returns the packed little-endian payload described in
+    ``api.chart_data.to_binary``.
+    """
+
+    def get(self, request, run_id):
+        query = SeriesQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+
+        try:
+            series = load_series(run_id)
+        except FileNotFoundError:
+            raise Http404("Unknown prediction run")
+
+        columns = chart_series(
+            series, params.get("start"), params.get("end"), params.get("points")
+        )
+
+        if params["payload"] == "binary":
+            response = HttpResponse(
+                to_binary(columns), content_type="application/octet-stream"
+            )
+            response["X-Series-Count"] = len(columns["dates"])
+            response["X-Series-Columns"] = ",".join(["date", *BINARY_COLUMNS])
+            return response
+
+        return Response({"ticker": series["ticker"], **to_json(columns)})
+
+
+class StockPredictionView(APIView):
+    def post(self, request, *args, **kwargs):
+        serializer = TickerSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        ticker = serializer.validated_data["ticker"]
+
+        try:
+            result = perform_prediction(ticker)
+            return Response(
+                prediction_response(request, result), status=status.HTTP_200_OK
+            )
+
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.exception("Prediction for %s failed", ticker)
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class StockPredictionStreamView(APIView):
+    """
+    ``StockPredictionView`` as a stream of progress events.
+
+    Emits one event per finished step of ``perform_prediction`` (metrics
+    arrive with ``inference``, before the series is persisted), then
+    ``result`` with the usual response body, or ``error``. Server-sent
+    events by default; ``Accept: application/x-ndjson`` for one JSON object
+    per line. Concurrent streams for one ticker share a single run.
+    """
+
+    def perform_content_negotiation(self, request, force=False):
+        # The stream picks its own format; JSON for validation errors
+        return super().perform_content_negotiation(request, force=True)
+
+    def post(self, request, *args, **kwargs):
+        serializer = TickerSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            ticker = price_store.check_ticker(serializer.validated_data["ticker"])
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        def work(emit):
+            return perform_prediction(ticker, on_phase=emit)
+
+        # One run per ticker and trading day, like prediction jobs; a second
+        # or reconnecting client follows it from the first event
+        return event_stream_response(
+            request,
+            work,
+            key=("prediction", ticker, latest_trading_day()),
+            present=partial(prediction_response, request),
+        )
+
+
+class PredictionJobView(APIView):
+    """
+    Queue a full-history prediction and return immediately.
+
+    Submissions for a ticker that is already being computed for the current
+    trading day attach to the in-flight job instead of starting a new one.
+    """
+
+    def post(self, request, *args, **kwargs):
+        serializer = TickerSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            ticker = price_store.check_ticker(serializer.validated_data["ticker"])
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        job, created = submit_prediction(ticker)
+
+        return Response(
+            {
+                "job_id": str(job.pk),
+                "status": job.status,
+                "created": created,
+                "status_url": request.build_absolute_uri(
+                    reverse("prediction-job-detail", args=[job.pk])
+                ),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class PredictionJobDetailView(APIView):
+    """
+    Poll a prediction job; ``result`` is filled in once it succeeds. A job
+    still pending/running past ML_JOB_TIMEOUT_SECONDS is reported failed.
+    """
+
+    def get(self, request, job_id):
+        fail_overdue_jobs(pk=job_id)
+        job = get_object_or_404(PredictionJob, pk=job_id)
+        data = PredictionJobSerializer(job).data
+        if job.status == "succeeded":
+            data["result"] = prediction_response(request, job.result)
+        return Response(data)
+
+
+class PredictNextDayAPIView(APIView):
+    def get(self, request):
+        ticker = request.GET.get("ticker", "MSFT").upper().strip()
+        query = ForecastQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        horizon = query.validated_data["horizon"]
+
+        seq_length = settings.ML_SEQUENCE_LENGTH
+        model_path = active_model_path()
+
+        if not os.path.exists(model_path):
+            return Response(
+                {"error": f"Model file not found at {model_path}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        try:
+            # --- 1-2) Rolling per-ticker state; model runs only on a new bar ---
+            try:
+                prediction = next_day_prediction(ticker, seq_length, horizon)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            # --- 3) Company info (cached, refreshed in the background) ---
+            with phase("company_info"):
+                name = company_name(ticker)
+
+            # --- 4) Return JSON ---
+            return Response({"ticker": ticker, "company_name": name, **prediction})
+
+        except Exception as e:
+            logger.exception("Next-day prediction for %s failed", ticker)
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+# --- Async (ASGI) variant ---
+# Blocking work runs in threads so the event loop keeps accepting requests:
+# I/O on the loop's default executor, inference on a small dedicated pool
+# so a burst of requests can't run dozens of model calls at once.
+
+_inference_executor = None
+_inference_executor_lock = threading.Lock()
+
+
+def inference_executor() -> ThreadPoolExecutor:
+    global _inference_executor
+    with _inference_executor_lock:
+        if _inference_executor is None:
+            _inference_executor = ThreadPoolExecutor(
+                max_workers=settings.ML_ASYNC_INFERENCE_THREADS,
+                thread_name_prefix="ml-inference",
+            )
+        return _inference_executor
+
+
+def _timed(name, func, *args):
+    """Run ``func`` inside ``phase(name)``, releasing the thread's DB connection."""
+    try:
+        with phase(name):
+            return func(*args)
+    finally:
+        close_old_connections()
+
+
+async def _run_inference(func, *args):
+    # run_in_executor doesn't carry contextvars over like to_thread does
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(inference_executor(), context.run, func, *args)
+
+
+async def predict_next_day_async(request):
+    """
+    ``PredictNextDayAPIView`` for ASGI workers.
+
+    Prices and company info are fetched concurrently, so a cold request
+    takes about as long as the slower of the two rather than their sum.
+    """
+    query = ForecastQuerySerializer(data=request.GET)
+    if not query.is_valid():
+        return JsonResponse(query.errors, status=status.HTTP_400_BAD_REQUEST)
+    horizon = query.validated_data["horizon"]
+
+    model_path = active_model_path()
+    if not os.path.exists(model_path):
+        return JsonResponse(
+            {"error": f"Model file not found at {model_path}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    try:
+        ticker = price_store.check_ticker(request.GET.get("ticker", "MSFT"))
+
+        # --- 1) Prices and company info, concurrently ---
+        state, name = await asyncio.gather(
+            asyncio.to_thread(_timed, "data_load", refresh_state, ticker),
+            asyncio.to_thread(_timed, "company_info", company_name, ticker),
+        )
+
+        # --- 2) Model on the bounded inference pool ---
+        prediction = await _run_inference(
+            predict_from_state, state, settings.ML_SEQUENCE_LENGTH, horizon
+        )
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.exception("Next-day prediction for %s failed", request.GET.get("ticker"))
+        return JsonResponse(
+            {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    # --- 3) Return JSON ---
+    return JsonResponse({"ticker": ticker, "company_name": name, **prediction})
+
+
+class BatchPredictNextDayAPIView(APIView):
+    """
+    Next-day predictions for a whole watchlist.
+
+    Prices for every ticker are refreshed with one bulk download and all
+    windows are scored with a single batched ``model.predict``.
+    """
+
+    def post(self, request):
+        serializer = TickerListSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        results, errors, valid = {}, {}, []
+        for ticker in serializer.validated_data["tickers"]:
+            try:
+                valid.append(price_store.check_ticker(ticker))
+            except ValueError as e:
+                errors[ticker] = str(e)
+
+        try:
+            with phase("data_load"):
+                closes = price_store.get_many(valid, history_start())
+            with phase("model_load"):
+                model = get_model()
+            with phase("inference"):
+                results, batch_errors = predict_next_day(
+                    model, closes, horizon=serializer.validated_data["horizon"]
+                )
+            errors.update(batch_errors)
+        except Exception as e:
+            logger.exception("Batch prediction for %d tickers failed", len(valid))
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        return Response({"results": results, "errors": errors})
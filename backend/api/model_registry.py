@@ -0,0 +1,172 @@
+# api/model_registry.py
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadedModel:
+    model: object
+    path: str
+    signature: tuple  # (mtime_ns, size) of the file when it was checked
+    digest: str  # sha256 of the file contents
+    loaded_at: float
+
+
+def active_model_path() -> Path:
+    """The model file the configured runtime (ML_INFERENCE_RUNTIME) serves."""
+    if settings.ML_INFERENCE_RUNTIME == "tflite":
+        from .lite import variant_path
+
+        return variant_path(settings.ML_MODEL_PATH, settings.ML_TFLITE_VARIANT)
+    return Path(settings.ML_MODEL_PATH)
+
+
+def file_digest(path: str) -> str:
+    """sha256 of a file, read in chunks so big models don't spike memory."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of models (Keras, or TFLite for ``.tflite`` files).
+
+    Each model is loaded once per worker process and warmed up with a dummy
+    predict so the first real request doesn't pay for graph building. Every
+    lookup does a cheap ``os.stat``; when the mtime/size changes the file is
+    re-hashed and the model is reloaded only if the contents really changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, LoadedModel] = {}
+        self._digests: dict[str, tuple] = {}  # path -> (signature, digest)
+
+    def get(self, path=None) -> LoadedModel:
+        path = str(path or active_model_path())
+        stat = os.stat(path)  # FileNotFoundError is the caller's problem
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._entries.get(path)
+        if entry is not None and entry.signature == signature:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature == signature:
+                return entry
+
+            digest = self.model_hash(path)
+            if entry is not None and entry.digest == digest:
+                # File was touched/re-copied but the bytes are identical
+                entry.signature = signature
+                return entry
+
+            entry = self._load(path, signature, digest)
+            self._entries[path] = entry
+            return entry
+
+    def get_model(self, path=None):
+        return self.get(path).model
+
+    def model_hash(self, path=None) -> str:
+        """
+        sha256 of the model file, without loading it into TensorFlow.
+
+        Cached by mtime/size, so this is an ``os.stat`` on the hot path.
+        """
+        path = str(path or active_model_path())
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._digests.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        digest = file_digest(path)
+        self._digests[path] = (signature, digest)
+        return digest
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+
+    def _load(self, path, signature, digest) -> LoadedModel:
+        started = time.perf_counter()
+        if path.endswith(".tflite"):
+            from .lite import TFLiteModel
+
+            model = TFLiteModel(path, num_threads=settings.ML_TFLITE_THREADS)
+        else:
+            from tensorflow.keras.models import load_model
+
+            model = load_model(path)
+        self._warm_up(model)
+        logger.info(
+            "Loaded model %s (%s) in %.2fs",
+            path,
+            digest[:12],
+            time.perf_counter() - started,
+        )
+        return LoadedModel(
+            model=model,
+            path=path,
+            signature=signature,
+            digest=digest,
+            loaded_at=time.time(),
+        )
+
+    @staticmethod
+    def _warm_up(model):
+        # Build the predict function once with the real input shape so the
+        # first request doesn't trigger tracing.
+        _, *shape = model.input_shape
+        shape = [dim or settings.ML_SEQUENCE_LENGTH for dim in shape]
+        model.predict(np.zeros((1, *shape), dtype="float32"), verbose=0)
+
+
+registry = ModelRegistry()
+
+
+_remote = None
+
+
+def get_model(path=None):
+    """
+    Shortcut used by the views: the warmed-up model for ``path``, or a client
+    for the local inference server when ML_INFERENCE_SOCKET is set.
+    """
+    global _remote
+    if settings.ML_INFERENCE_SOCKET and path is None:
+        if _remote is None:
+            from .inference import RemoteModel
+
+            _remote = RemoteModel(
+                settings.ML_INFERENCE_SOCKET, settings.ML_INFERENCE_TIMEOUT_SECONDS
+            )
+        return _remote
+    return registry.get_model(path)
+
+
+def preload():
+    """Load the default model at startup; never take the worker down."""
+    if settings.ML_INFERENCE_SOCKET:
+        return  # the inference server owns the model
+    try:
+        registry.get()
+    except Exception:
+        logger.exception("Could not preload model from %s", active_model_path())
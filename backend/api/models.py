@@ -1,3 +1,91 @@
+import uuid
+
 from django.db import models
+from django.db.models import Q
+
+JOB_STATUS = [
+    ("pending", "Pending"),
+    ("running", "Running"),
+    ("succeeded", "Succeeded"),
+    ("failed", "Failed"),
+]
+ACTIVE_JOB_STATUSES = ["pending", "running"]
+
+
+class PredictionJob(models.Model):
+    """
+    A full-history prediction (``perform_prediction``) run in the background.
+
+    At most one pending/running job exists per (ticker, trading day), so
+    concurrent submissions attach to the job that is already in flight.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    ticker = models.CharField(max_length=10)
+    trading_day = models.DateField()
+    status = models.CharField(max_length=20, choices=JOB_STATUS, default="pending")
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=["ticker", "trading_day"],
+                condition=Q(status__in=ACTIVE_JOB_STATUSES),
+                name="unique_active_prediction_job",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.ticker} {self.trading_day} ({self.status})"
+
+
+class TickerInfo(models.Model):
+    """
+    Persistent copy of the static bits of ``yf.Ticker(t).info`` so workers
+    restart with a warm metadata cache (see ``api.ticker_info``).
+    """
+
+    ticker = models.CharField(max_length=16, primary_key=True)
+    long_name = models.CharField(max_length=200, blank=True, default="")
+    info = models.JSONField(default=dict)
+    fetched_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.long_name or self.ticker
+
+
+class TickerAccuracy(models.Model):
+    """
+    Backtest accuracy of one model on one ticker, precomputed by
+    ``manage.py evaluate_universe`` so the leaderboard is a table read.
+    """
+
+    ticker = models.CharField(max_length=16)
+    model_hash = models.CharField(max_length=64)  # sha256 of the model file
+    as_of = models.DateField()  # last bar covered by the backtest
+    years = models.PositiveSmallIntegerField()
+    mse = models.FloatField()
+    rmse = models.FloatField()
+    r2 = models.FloatField(null=True)  # undefined for a flat series
+    evaluated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=["ticker", "model_hash"], name="unique_ticker_accuracy"
+            ),
+        )
+        # One per leaderboard sort, all scoped to a model
+        indexes = (
+            models.Index(fields=["model_hash", "rmse"]),
+            models.Index(fields=["model_hash", "mse"]),
+            models.Index(fields=["model_hash", "r2"]),
+            models.Index(fields=["evaluated_at"]),
+        )
 
-# Create your models here.
+    def __str__(self):
+        return f"{self.ticker} rmse={self.rmse:.4f} ({self.model_hash[:12]})"
@@ -0,0 +1,285 @@
+# api/next_day.py
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from sklearn.preprocessing import MinMaxScaler
+
+from .forecast import recursive_forecast
+from .model_registry import get_model, registry
+from .price_store import REFETCH_BARS, price_store
+from .timing import phase
+
+# How much history the next-day scaler is fitted on
+HISTORY_DAYS = 365 * 2
+
+
+def history_start() -> datetime:
+    return datetime.now() - timedelta(days=HISTORY_DAYS)
+
+
+def prepare_input(close: pd.Series, seq_length: int):
+    """
+    Scale ``close`` on its own min/max and return the last window.
+
+    Returns ``(window, scaler)`` where ``window`` has shape ``(seq_length, 1)``.
+    """
+    scaler = MinMaxScaler(feature_range=(0, 1))
+    scaled = scaler.fit_transform(close.to_numpy().reshape(-1, 1))
+    return scaled[-seq_length:].astype("float32"), scaler
+
+
+def predict_next_day(model, closes: dict, seq_length=None, horizon=1):
+    """
+    Next-business-day prediction for every series in ``closes``.
+
+    Each series is scaled independently, then all windows go through the
+    model in one batched ``predict`` call (or one batched recursive forecast
+    when ``horizon`` > 1). Returns ``(results, errors)``, both keyed by ticker.
+    """
+    seq_length = seq_length or settings.ML_SEQUENCE_LENGTH
+    results, errors = {}, {}
+
+    windows, scalers, ready = [], [], []
+    for ticker, close in closes.items():
+        if len(close) < seq_length:
+            errors[ticker] = (
+                f"Not enough data for {ticker} to form sequence of {seq_length} days."
+            )
+            continue
+        window, scaler = prepare_input(close, seq_length)
+        windows.append(window)
+        scalers.append(scaler)
+        ready.append(ticker)
+
+    if not ready:
+        return results, errors
+
+    batch = np.stack(windows)
+    if horizon > 1:
+        forecasts = recursive_forecast(model, batch, horizon)
+        for i, (ticker, scaler) in enumerate(zip(ready, scalers)):
+            close = closes[ticker]
+            prices = scaler.inverse_transform(forecasts[i].reshape(-1, 1)).ravel()
+            results[ticker] = _forecast_payload(close.index[-1], close.iloc[-1], prices)
+        return results, errors
+
+    predicted_scaled = model.predict(batch, batch_size=len(batch), verbose=0)
+
+    for i, (ticker, scaler) in enumerate(zip(ready, scalers)):
+        close = closes[ticker]
+        predicted_price = scaler.inverse_transform(predicted_scaled[i : i + 1])[0][0]
+        results[ticker] = _payload(close.index[-1], close.iloc[-1], predicted_price)
+
+    return results, errors
+
+
+def _payload(last_date, last_close, predicted_price) -> dict:
+    last_date = pd.Timestamp(last_date)
+    prediction_date = last_date + pd.tseries.offsets.BDay(1)
+    return {
+        "predicted_price": round(float(predicted_price), 2),
+        "prediction_date": prediction_date.strftime("%Y-%m-%d"),
+        "last_close_price": round(float(last_close), 2),
+        "last_close_date": last_date.strftime("%Y-%m-%d"),
+    }
+
+
+def _forecast_payload(last_date, last_close, prices) -> dict:
+    """``_payload`` for the first day plus the whole business-day path."""
+    dates = pd.bdate_range(
+        pd.Timestamp(last_date) + pd.tseries.offsets.BDay(1), periods=len(prices)
+    )
+    return {
+        **_payload(last_date, last_close, prices[0]),
+        "horizon": len(prices),
+        "forecast": [
+            {"date": day.strftime("%Y-%m-%d"), "predicted_price": round(float(p), 2)}
+            for day, p in zip(dates, prices)
+        ],
+    }
+
+
+# --- Incremental per-ticker state ---
+# Repeated polling of one ticker shouldn't reload two years of prices, refit
+# a scaler and run the model again when nothing has changed. Each worker
+# keeps the scaler window per ticker and rolls it forward bar by bar.
+
+
+@dataclass(frozen=True)
+class NextDayState:
+    ticker: str
+    dates: np.ndarray  # datetime64[D], the last HISTORY_DAYS of bars
+    closes: np.ndarray  # float64, aligned with dates
+    low: float  # running min/max of closes == the fitted MinMaxScaler
+    high: float
+    checked_at: float  # last time we looked for new bars
+    prediction: dict | None = None
+    prediction_key: tuple | None = None  # (last bar, last close, model hash)
+    forecast: np.ndarray | None = None  # longest multi-day path computed so far
+    forecast_key: tuple | None = None
+
+    @classmethod
+    def from_close(cls, ticker, close: pd.Series):
+        closes = close.to_numpy(dtype="f8")
+        return cls(
+            ticker=ticker,
+            dates=close.index.values.astype("datetime64[D]"),
+            closes=closes,
+            low=float(closes.min()) if len(closes) else 0.0,
+            high=float(closes.max()) if len(closes) else 0.0,
+            checked_at=time.time(),
+        )
+
+    def advance(self, new: pd.Series, cutoff: np.datetime64):
+        """
+        Merge new bars, drop bars older than ``cutoff``, keep min/max.
+
+        ``new`` may start at or before our last bar (the price store re-fetches
+        the last few sessions); those held bars are replaced by ``new``.
+        """
+        new_dates = new.index.values.astype("datetime64[D]")
+        new_closes = new.to_numpy(dtype="f8")
+        keep = len(self.dates)
+        if len(new_dates):
+            keep = np.searchsorted(self.dates, new_dates[0])
+        dates = np.concatenate([self.dates[:keep], new_dates])
+        closes = np.concatenate([self.closes[:keep], new_closes])
+
+        first = np.searchsorted(dates, cutoff)
+        # Bars that left the state: evicted by age or replaced by a new value
+        removed = np.concatenate([closes[:first], self.closes[keep:]])
+        dates, closes = dates[first:], closes[first:]
+
+        low, high = self.low, self.high
+        if len(removed) and (removed.min() <= low or removed.max() >= high):
+            # An extreme left the window; only then is a full rescan needed
+            low = float(closes.min()) if len(closes) else 0.0
+            high = float(closes.max()) if len(closes) else 0.0
+        elif len(new_closes):
+            low = min(low, float(new_closes.min()))
+            high = max(high, float(new_closes.max()))
+
+        return replace(
+            self,
+            dates=dates,
+            closes=closes,
+            low=low,
+            high=high,
+            checked_at=time.time(),
+        )
+
+    def scaled_window(self, seq_length) -> np.ndarray:
+        # Same as MinMaxScaler(0, 1), including its handling of a flat series
+        span = self.high - self.low or 1.0
+        window = (self.closes[-seq_length:] - self.low) / span
+        return window.astype("float32").reshape(1, seq_length, 1)
+
+    def unscale(self, value):
+        """Scaled value(s) back to prices; works on scalars and arrays."""
+        span = self.high - self.low or 1.0
+        return np.asarray(value, dtype="f8") * span + self.low
+
+
+_states: OrderedDict[str, NextDayState] = OrderedDict()
+_states_lock = threading.Lock()
+
+
+def _get_state(ticker):
+    with _states_lock:
+        state = _states.get(ticker)
+        if state is not None:
+            _states.move_to_end(ticker)
+        return state
+
+
+def _put_state(state: NextDayState):
+    with _states_lock:
+        _states[state.ticker] = state
+        _states.move_to_end(state.ticker)
+        while len(_states) > settings.ML_NEXT_DAY_STATE_SIZE:
+            _states.popitem(last=False)
+
+
+def refresh_state(ticker: str) -> NextDayState:
+    """
+    Current state for ``ticker``. Within ML_PRICE_REFRESH_SECONDS of the last
+    check nothing is read at all; after that only the last REFETCH_BARS bars
+    we hold and anything newer are pulled from the price store, so a revised
+    close replaces the one we had.
+    """
+    state = _get_state(ticker)
+    if state is not None and (
+        time.time() - state.checked_at < settings.ML_PRICE_REFRESH_SECONDS
+    ):
+        return state
+
+    start = history_start()
+    if state is None or not len(state.dates):
+        state = NextDayState.from_close(ticker, price_store.get_close(ticker, start))
+    else:
+        since = state.dates[-min(REFETCH_BARS, len(state.dates))].astype(date)
+        new = price_store.get_close(ticker, since)
+        state = state.advance(new, np.datetime64(start.date(), "D"))
+
+    _put_state(state)
+    return state
+
+
+def next_day_prediction(ticker: str, seq_length=None, horizon=1) -> dict:
+    """
+    Next-business-day prediction for one ticker, reusing the rolling state.
+
+    With ``horizon`` > 1 the payload also carries the recursive forecast for
+    that many business days. Runs the model only when a new bar arrived or
+    the model file changed; a shorter horizon is sliced from a longer one
+    already computed. Raises ValueError when there isn't enough history.
+    """
+    ticker = price_store.check_ticker(ticker)
+    with phase("data_load"):
+        state = refresh_state(ticker)
+    return predict_from_state(state, seq_length, horizon)
+
+
+def predict_from_state(state: NextDayState, seq_length=None, horizon=1) -> dict:
+    """The model half of ``next_day_prediction``, for a state already loaded."""
+    seq_length = seq_length or settings.ML_SEQUENCE_LENGTH
+    if len(state.closes) < seq_length:
+        raise ValueError(
+            f"Not enough data for {state.ticker} to form sequence of {seq_length} days."
+        )
+
+    key = (state.dates[-1], state.closes[-1], registry.model_hash())
+    if horizon > 1:
+        return _forecast(state, key, seq_length, horizon)
+    if state.prediction_key == key:
+        return state.prediction
+
+    with phase("model_load"):
+        model = get_model()
+    with phase("inference"):
+        predicted_scaled = model.predict(state.scaled_window(seq_length), verbose=0)
+    prediction = _payload(
+        state.dates[-1], state.closes[-1], state.unscale(predicted_scaled[0][0])
+    )
+    _put_state(replace(state, prediction=prediction, prediction_key=key))
+    return prediction
+
+
+def _forecast(state: NextDayState, key, seq_length, horizon) -> dict:
+    if state.forecast_key != key or len(state.forecast) < horizon:
+        window = state.scaled_window(seq_length)
+        with phase("model_load"):
+            model = get_model()
+        with phase("inference"):
+            forecast = state.unscale(recursive_forecast(model, window, horizon)[0])
+        state = replace(state, forecast=forecast, forecast_key=key)
+        _put_state(state)
+    return _forecast_payload(
+        state.dates[-1], state.closes[-1], state.forecast[:horizon]
+    )
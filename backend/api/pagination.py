@@ -1,8 +1,62 @@
 # api/pagination.py
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
 class SmallResultsSetPagination(PageNumberPagination):
     page_size = 2  # default if none provided
     page_size_query_param = "page_size"  # lets frontend set ?page_size=2
     max_page_size = 100  # maximum allowed
+
+
+class CreatedCursorPagination(CursorPagination):
+    """
+    Keyset pagination on ``(-created_at, -id)``: each page is an index range
+    scan from the previous page's last row, with no COUNT(*) or OFFSET, and
+    rows inserted meanwhile never shift or repeat entries.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = SmallResultsSetPagination.page_size
+    page_size_query_param = "page_size"
+    max_page_size = SmallResultsSetPagination.max_page_size
+
+    def get_ordering(self, request, queryset, view):
+        # ?ordering= would make the cursor position ambiguous
+        return self.ordering
+
+
+class OptionalCursorPagination(SmallResultsSetPagination):
+    """
+    Page numbers by default; ``?pagination=cursor`` (or any ``?cursor=``,
+    which the ``next``/``previous`` links carry) switches to
+    ``CreatedCursorPagination``. The cursor response has ``next`` and
+    ``previous`` but no ``count``.
+    """
+
+    cursor_class = CreatedCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if params.get("pagination") == "cursor" or "cursor" in params:
+            self.cursor = self.cursor_class()
+            page = self.cursor.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.cursor.display_page_controls
+            return page
+        self.cursor = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor is not None:
+            return self.cursor.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor is not None:
+            return self.cursor.to_html()
+        return super().to_html()
+
+
+class LeaderboardPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
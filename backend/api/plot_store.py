@@ -0,0 +1,145 @@
+# api/plot_store.py
+import fcntl
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+from django.conf import settings
+
+from .files import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class PlotStore:
+    """
+    Content-addressed PNG store with a disk budget, shared by all workers.
+
+    ``blobs/<aa>/<sha256>.png`` holds rendered bytes named by their hash, so
+    identical renders are stored once; ``refs/<run_id>/<kind>`` holds the
+    hash a plot resolved to. Both are written atomically. Every hit bumps
+    the blob's mtime and eviction removes the oldest blobs first, so the
+    budget is enforced LRU. A ref whose blob was evicted is just a miss and
+    the plot is rendered again.
+
+    The series the plots are drawn from (``series/<aa>/<run_id>.npz``, see
+    ``api.plots``) live here too and share the budget and the LRU order; an
+    evicted series makes its cached result a miss, so it is recomputed.
+    """
+
+    LOW_WATERMARK = 0.9  # evict down to this fraction of the budget
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = Path(root or Path(settings.ML_DATA_DIR) / "plots")
+        self.max_bytes = max_bytes or settings.ML_PLOT_STORE_MAX_BYTES
+
+    def blob_path(self, digest) -> Path:
+        return self.root / "blobs" / digest[:2] / f"{digest}.png"
+
+    def ref_path(self, run_id, kind) -> Path:
+        return self.root / "refs" / run_id / kind
+
+    def series_path(self, run_id) -> Path:
+        return self.root / "series" / run_id[:2] / f"{run_id}.npz"
+
+    def get(self, run_id, kind) -> Path | None:
+        try:
+            digest = self.ref_path(run_id, kind).read_text().strip()
+            path = self.blob_path(digest)
+            os.utime(path)  # LRU clock
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, run_id, kind, data: bytes) -> Path:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        try:
+            os.utime(path)  # same bytes already stored (dedup)
+        except FileNotFoundError:
+            atomic_write(path, lambda fh: fh.write(data))
+            self.evict(keep=path)
+        atomic_write(self.ref_path(run_id, kind), lambda fh: fh.write(digest.encode()))
+        return path
+
+    def evict(self, keep=None):
+        """
+        Drop least recently used blobs and series once over budget.
+
+        ``keep`` is the file just written: it is never evicted, even when it
+        alone is over budget, so the caller doesn't get back a dead path.
+        Only one process evicts at a time; the others skip rather than wait.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".evict.lock", "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return
+
+            blobs = []
+            for directory, suffix in [("blobs", ".png"), ("series", ".npz")]:
+                for entry in self._scan(self.root / directory):
+                    if entry.name.endswith(suffix):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue  # removed since listing
+                        blobs.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in blobs)
+            if total <= self.max_bytes:
+                return
+
+            target = self.max_bytes * self.LOW_WATERMARK
+            for _, size, path in sorted(blobs):
+                if total <= target:
+                    break
+                if path == str(keep):
+                    continue
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+            self._prune_refs()
+            logger.info("Evicted plots down to %d bytes", total)
+
+    def _prune_refs(self):
+        # Refs are tiny, but drop the ones whose blob is gone so the
+        # directory doesn't keep growing with dead runs
+        for entry in self._scan(self.root / "refs"):
+            try:
+                digest = Path(entry.path).read_text().strip()
+                if not self.blob_path(digest).exists():
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass  # the run's refs went away while scanning
+        try:
+            run_dirs = list(os.scandir(self.root / "refs"))
+        except FileNotFoundError:
+            return  # only series stored so far
+        for run_dir in run_dirs:
+            try:
+                os.rmdir(run_dir.path)
+            except OSError:
+                pass  # not empty
+
+    @staticmethod
+    def _scan(directory):
+        """Files one level below each subdirectory of ``directory``."""
+        try:
+            subdirs = [e for e in os.scandir(directory) if e.is_dir()]
+        except FileNotFoundError:
+            return
+        for subdir in subdirs:
+            try:
+                entries = list(os.scandir(subdir.path))
+            except FileNotFoundError:
+                continue  # removed since listing
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith("."):
+                    yield entry
+
+
+plot_store = PlotStore()
@@ -0,0 +1,141 @@
+# api/plots.py
+import io
+import os
+import warnings
+from pathlib import Path
+
+import numpy as np
+import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .files import atomic_write
+from .plot_store import plot_store
+
+warnings.filterwarnings("ignore")
+sns.set_theme(style="whitegrid", palette="muted", font_scale=1.2)
+
+# --- Persisted series ---
+# perform_prediction stores what it computed; plots (and anything else that
+# wants the raw numbers) are derived from it later, on demand. The files sit
+# in the plot store, under its disk budget.
+
+
+def series_path(run_id: str) -> Path:
+    return plot_store.series_path(run_id)
+
+
+def save_series(run_id, ticker, dates, actual, predicted):
+    arrays = {
+        "ticker": np.array(ticker),
+        "dates": np.asarray(dates, dtype="datetime64[D]"),
+        "actual": np.asarray(actual, dtype="float32"),
+        "predicted": np.asarray(predicted, dtype="float32"),
+    }
+    path = series_path(run_id)
+    atomic_write(path, lambda fh: np.savez(fh, **arrays))
+    plot_store.evict(keep=path)
+
+
+def load_series(run_id) -> dict:
+    """Raises FileNotFoundError for unknown runs."""
+    path = series_path(run_id)
+    with np.load(path) as data:
+        series = {
+            "ticker": str(data["ticker"]),
+            "dates": data["dates"],
+            "actual": data["actual"],
+            "predicted": data["predicted"],
+        }
+    os.utime(path)  # LRU clock, as for plot hits
+    return series
+
+
+# --- Renderers ---
+# Object-oriented matplotlib (no pyplot state machine) so concurrent
+# requests in one process can't draw on each other's figures.
+
+
+def _prediction_plot(series):
+    fig = Figure(figsize=(14, 7))
+    ax = fig.subplots()
+    sns.lineplot(
+        x=series["dates"], y=series["actual"], label="Actual", color="blue", ax=ax
+    )
+    sns.lineplot(
+        x=series["dates"],
+        y=series["predicted"],
+        label="Predicted",
+        color="red",
+        linestyle="--",
+        ax=ax,
+    )
+    ax.set_title(f"{series['ticker']} Stock Price Prediction")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Price (USD)")
+    ax.legend()
+    return fig
+
+
+def _residuals_plot(series):
+    residuals = series["actual"] - series["predicted"]
+    fig = Figure(figsize=(14, 5))
+    ax = fig.subplots()
+    sns.lineplot(x=series["dates"], y=residuals, color="purple", ax=ax)
+    ax.axhline(0, color="black", linestyle="--")
+    ax.set_title(f"{series['ticker']} Residuals (Actual - Predicted)")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Residual (USD)")
+    return fig
+
+
+def _residuals_distribution(series):
+    residuals = series["actual"] - series["predicted"]
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
+    sns.histplot(
+        residuals,
+        kde=True,
+        bins=30,
+        color="teal",
+        edgecolor="black",
+        alpha=0.6,
+        ax=ax,
+    )
+    ax.axvline(0, color="red", linestyle="--", linewidth=2, label="Zero Error")
+    ax.set_title(f"{series['ticker']} Residuals Distribution")
+    ax.set_xlabel("Residual (USD)")
+    ax.set_ylabel("Frequency")
+    ax.legend()
+    return fig
+
+
+PLOT_KINDS = {
+    "prediction_plot": _prediction_plot,
+    "residuals_plot": _residuals_plot,
+    "residuals_distribution": _residuals_distribution,
+}
+
+
+def render_plot(series, kind) -> bytes:
+    fig = PLOT_KINDS[kind](series)
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    FigureCanvasAgg(fig).print_png(buffer)
+    return buffer.getvalue()
+
+
+def get_plot(run_id, kind) -> Path:
+    """
+    Path of the rendered PNG, drawing it first if the store doesn't have it
+    (never requested, or evicted since).
+
+    Raises KeyError for unknown kinds and FileNotFoundError for unknown runs.
+    """
+    if kind not in PLOT_KINDS:
+        raise KeyError(kind)
+
+    path = plot_store.get(run_id, kind)
+    if path is None:
+        path = plot_store.put(run_id, kind, render_plot(load_series(run_id), kind))
+    return path
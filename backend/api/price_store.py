@@ -0,0 +1,203 @@
+# api/price_store.py
+import fcntl
+import json
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from .files import atomic_write
+from .providers import get_provider
+
+# One row per trading day. Stored as a plain .npy so every worker can
+# np.load(..., mmap_mode="r") the same file and share the pages.
+PRICE_DTYPE = np.dtype([("date", "datetime64[D]"), ("close", "f8")])
+
+TICKER_RE = re.compile(r"^[A-Z0-9][A-Z0-9.\-^=]{0,14}$")
+
+# Stored bars fetched again on every refresh: the last one may be a partial
+# intraday close, and the provider may revise recent sessions
+REFETCH_BARS = 3
+
+
+def latest_trading_day(today: date | None = None) -> date:
+    """Most recent weekday on or before ``today`` (holidays are not modelled)."""
+    today = today or date.today()
+    while today.weekday() >= 5:
+        today -= timedelta(days=1)
+    return today
+
+
+def _to_rows(close: pd.Series) -> np.ndarray:
+    rows = np.empty(len(close), dtype=PRICE_DTYPE)
+    rows["date"] = close.index.values.astype("datetime64[D]")
+    rows["close"] = close.to_numpy(dtype="f8")
+    return rows
+
+
+class PriceStore:
+    """
+    Local, incrementally updated cache of daily close prices.
+
+    Layout per ticker under ``root``:
+        <TICKER>.npy   structured array (date, close), sorted by date
+        <TICKER>.json  {"start": first date we asked the provider for,
+                        "checked_at": unix time of the last provider call}
+        <TICKER>.lock  flock() target so workers don't download twice
+
+    Reads are memory-mapped. Writes go to a temp file that is atomically
+    renamed over the old one, so readers never see a half-written file.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root or settings.ML_PRICE_STORE_DIR)
+
+    # --- Public API ---
+
+    def get_close(self, ticker: str, start: date) -> pd.Series:
+        """Daily closes for ``ticker`` from ``start`` up to the latest bar."""
+        return self.get_many([ticker], start)[self.check_ticker(ticker)]
+
+    def get_many(self, tickers, start: date) -> dict[str, pd.Series]:
+        """
+        Daily closes for several tickers. Everything that needs refreshing is
+        fetched with a single multi-symbol download.
+        """
+        tickers = sorted({self.check_ticker(t) for t in tickers})
+        start = _as_date(start)
+
+        stale = [t for t in tickers if self._is_stale(*self._read(t), start)]
+        if stale:
+            self._refresh(stale, start)
+
+        return {t: self._window(self._read(t)[0], start) for t in tickers}
+
+    def check_ticker(self, ticker: str) -> str:
+        ticker = ticker.upper().strip()
+        if not TICKER_RE.match(ticker):
+            raise ValueError(f"Invalid ticker symbol: {ticker!r}")
+        return ticker
+
+    # --- Internals ---
+
+    def _paths(self, ticker):
+        return (
+            self.root / f"{ticker}.npy",
+            self.root / f"{ticker}.json",
+            self.root / f"{ticker}.lock",
+        )
+
+    def _read(self, ticker):
+        data_path, meta_path, _ = self._paths(ticker)
+        try:
+            rows = np.load(data_path, mmap_mode="r")
+            meta = json.loads(meta_path.read_text())
+        except FileNotFoundError:
+            return np.empty(0, dtype=PRICE_DTYPE), {}
+        return rows, meta
+
+    @staticmethod
+    def _window(rows, start: date) -> pd.Series:
+        first = np.searchsorted(rows["date"], np.datetime64(start, "D"))
+        window = rows[first:]
+        return pd.Series(
+            window["close"],
+            index=pd.DatetimeIndex(window["date"], name="Date"),
+            name="Close",
+        )
+
+    def _is_stale(self, rows, meta, start: date) -> bool:
+        if not meta:
+            return True
+        if start < date.fromisoformat(meta["start"]):
+            return True  # caller wants more history than we have
+
+        # Even with a bar for the latest trading day stored, it may have been
+        # an intraday snapshot, so refresh once the check interval has passed
+        return time.time() - meta["checked_at"] >= settings.ML_PRICE_REFRESH_SECONDS
+
+    def _missing_range(self, rows, meta, start: date) -> tuple[date, date]:
+        """Smallest [start, end) range covering everything ``rows`` lacks."""
+        known_start = date.fromisoformat(meta["start"]) if meta else start
+        end = date.today() + timedelta(days=1)  # providers treat end as exclusive
+        if not len(rows):
+            return min(start, known_start), end
+
+        if start < known_start:
+            # Backfill, through to today so the tail is refreshed as well
+            return start, end
+        # Overlap the last few stored bars so they are replaced, not kept
+        return rows["date"][-min(REFETCH_BARS, len(rows))].astype(date), end
+
+    def _refresh(self, tickers, start: date):
+        with ExitStack() as stack:
+            # Sorted lock order so two bulk refreshes can't deadlock
+            for ticker in tickers:
+                stack.enter_context(self._locked(ticker))
+
+            # Another worker may have refreshed while we waited for the locks
+            pending = {}
+            for ticker in tickers:
+                rows, meta = self._read(ticker)
+                if self._is_stale(rows, meta, start):
+                    missing = self._missing_range(rows, meta, start)
+                    pending[ticker] = (rows, meta, missing)
+            if not pending:
+                return
+
+            # One multi-symbol download per missing range, so a new ticker's
+            # full history doesn't widen the others' short refreshes
+            by_range = {}
+            for ticker, (_, _, missing) in pending.items():
+                by_range.setdefault(missing, []).append(ticker)
+            downloaded = {}
+            for (fetch_start, fetch_end), group in by_range.items():
+                downloaded.update(self._download(group, fetch_start, fetch_end))
+
+            for ticker, (rows, meta, (fetch_start, _)) in pending.items():
+                known_start = date.fromisoformat(meta["start"]) if meta else start
+                parts = [np.asarray(rows), downloaded.get(ticker, rows[:0])]
+                merged = np.concatenate(parts)
+                # Stable sort keeps stored rows ahead of downloaded ones on the
+                # same date; keeping the last of each date prefers the download
+                merged = merged[np.argsort(merged["date"], kind="stable")]
+                dates = merged["date"]
+                keep = np.ones(len(dates), dtype=bool)  # empty for unknown tickers
+                keep[:-1] = dates[1:] != dates[:-1]
+                meta = {
+                    "start": min(start, known_start, fetch_start).isoformat(),
+                    "checked_at": time.time(),
+                }
+                self._write(ticker, merged[keep], meta)
+
+    def _download(self, tickers, start: date, end: date) -> dict[str, np.ndarray]:
+        closes = get_provider().download_closes(tickers, start, end)
+        return {ticker: _to_rows(close) for ticker, close in closes.items()}
+
+    def _write(self, ticker, rows, meta):
+        data_path, meta_path, _ = self._paths(ticker)
+        atomic_write(data_path, lambda fh: np.save(fh, rows))
+        atomic_write(meta_path, lambda fh: fh.write(json.dumps(meta).encode()))
+
+    @contextmanager
+    def _locked(self, ticker):
+        self.root.mkdir(parents=True, exist_ok=True)
+        _, _, lock_path = self._paths(ticker)
+        with open(lock_path, "w") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+price_store = PriceStore()
@@ -0,0 +1,206 @@
+# api/providers.py
+import json
+import threading
+from concurrent.futures import Future
+from datetime import date
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class MarketDataProvider:
+    """
+    Where price history and company metadata come from.
+
+    ``download_closes`` returns ``{ticker: Series}`` of daily closes for
+    ``start <= date < end``, indexed by date; unknown tickers are simply
+    missing from the result.
+    """
+
+    def download_closes(self, tickers, start: date, end: date) -> dict:
+        raise NotImplementedError
+
+    def ticker_info(self, ticker: str) -> dict:
+        raise NotImplementedError
+
+
+def _between(close: pd.Series, start, end) -> pd.Series:
+    index = close.index
+    return close[(index >= pd.Timestamp(start)) & (index < pd.Timestamp(end))]
+
+
+class _Request:
+    def __init__(self, tickers, start, end):
+        self.tickers = tuple(sorted(set(tickers)))
+        self.start = start
+        self.end = end
+        self.future = Future()
+
+    @property
+    def key(self):
+        return self.tickers, self.start, self.end
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    yfinance, with requests from concurrent threads merged.
+
+    Requests for the same date range arriving within ``batch_window``
+    seconds of each other are served by one multi-symbol ``yf.download``
+    covering all their tickers; an identical request that is already queued
+    or in flight is attached to instead of repeated.
+    """
+
+    def __init__(self, batch_window=None):
+        if batch_window is None:
+            batch_window = settings.ML_PROVIDER_BATCH_WINDOW_MS / 1000
+        self.batch_window = batch_window
+        self._lock = threading.Lock()
+        self._pending: list[_Request] = []
+        self._inflight: dict[tuple, _Request] = {}
+        self._timer = None
+
+    def download_closes(self, tickers, start, end) -> dict:
+        request = _Request(tickers, start, end)
+        with self._lock:
+            existing = self._inflight.get(request.key)
+            if existing is not None:
+                request = existing
+            else:
+                self._inflight[request.key] = request
+                self._pending.append(request)
+                if self._timer is None:
+                    self._timer = threading.Timer(self.batch_window, self._flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        return request.future.result()
+
+    def _flush(self):
+        with self._lock:
+            batch, self._pending, self._timer = self._pending, [], None
+
+        # One download per date range: folding a 3-bar refresh into a
+        # 10-year backfill would fetch 10 years of every ticker
+        groups = {}
+        for request in batch:
+            groups.setdefault((request.start, request.end), []).append(request)
+        for (start, end), group in groups.items():
+            self._serve(group, start, end)
+
+    def _serve(self, group, start, end):
+        tickers = sorted({t for request in group for t in request.tickers})
+        try:
+            closes = self._download(tickers, start, end)
+        except Exception as e:
+            for request in group:
+                request.future.set_exception(e)
+        else:
+            for request in group:
+                request.future.set_result(
+                    {t: closes[t] for t in request.tickers if t in closes}
+                )
+        finally:
+            with self._lock:
+                for request in group:
+                    self._inflight.pop(request.key, None)
+
+    @staticmethod
+    def _download(tickers, start, end) -> dict:
+        import yfinance as yf
+
+        df = yf.download(
+            tickers,
+            start=start,
+            end=end,
+            auto_adjust=True,
+            progress=False,
+            group_by="column",
+        )
+        if df.empty:
+            return {}
+
+        close = df["Close"]
+        if isinstance(close, pd.Series):  # old yfinance, single ticker
+            close = close.to_frame(tickers[0])
+        return {str(t): close[t].dropna() for t in close.columns}
+
+    def ticker_info(self, ticker):
+        import yfinance as yf
+
+        return yf.Ticker(ticker).info or {}
+
+
+class FileProvider(MarketDataProvider):
+    """
+    Offline provider backed by fixture files, for tests and benchmarks.
+
+    ``<root>/<TICKER>.csv`` (or ``.parquet``) with ``Date`` and ``Close``
+    columns; optional ``<root>/<TICKER>.json`` holds the ``info`` dict.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root or settings.ML_FIXTURES_DIR)
+
+    def download_closes(self, tickers, start, end) -> dict:
+        closes = {}
+        for ticker in tickers:
+            close = self.load(ticker)
+            if close is not None:
+                closes[ticker] = _between(close, start, end)
+        return closes
+
+    def load(self, ticker):
+        csv_path = self.root / f"{ticker}.csv"
+        parquet_path = self.root / f"{ticker}.parquet"
+        if csv_path.exists():
+            df = pd.read_csv(csv_path, index_col="Date", parse_dates=["Date"])
+        elif parquet_path.exists():
+            df = pd.read_parquet(parquet_path)
+            if "Date" in df.columns:
+                df = df.set_index("Date")
+        else:
+            return None
+        close = df["Close"].dropna().sort_index()
+        close.index = pd.DatetimeIndex(close.index).tz_localize(None)
+        return close
+
+    def save(self, ticker, close: pd.Series, info=None):
+        """Record a fixture (used to capture real data for offline runs)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        frame = close.rename("Close").to_frame()
+        frame.index.name = "Date"
+        frame.to_csv(self.root / f"{ticker}.csv")
+        if info is not None:
+            (self.root / f"{ticker}.json").write_text(json.dumps(info, indent=2))
+
+    def ticker_info(self, ticker):
+        path = self.root / f"{ticker}.json"
+        return json.loads(path.read_text()) if path.exists() else {}
+
+
+def synthetic_close(days=2600, seed=7, end=None) -> pd.Series:
+    """
+    Seeded random-walk closes on business days ending at ``end`` (today by
+    default): a stand-in fixture when no recorded prices are available.
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0004, 0.015, days)
+    index = pd.bdate_range(end=end or date.today(), periods=days, name="Date")
+    return pd.Series(100 * np.exp(np.cumsum(returns)), index=index, name="Close")
+
+
+PROVIDERS = {
+    "yfinance": "api.providers.YFinanceProvider",
+    "file": "api.providers.FileProvider",
+}
+
+
+@cache
+def get_provider() -> MarketDataProvider:
+    """The configured provider (ML_MARKET_DATA_PROVIDER), one per process."""
+    name = settings.ML_MARKET_DATA_PROVIDER
+    return import_string(PROVIDERS.get(name, name))()
@@ -0,0 +1,44 @@
+# api/result_cache.py
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .model_registry import registry
+from .plots import series_path
+
+
+def make_run_id(ticker, years, last_bar, model_hash, seq_length) -> str:
+    """
+    Content address of a full-history prediction: a hash of everything the
+    result depends on. A new bar or a new model file gives a new id, so
+    stale entries simply stop being hit and age out of the LRU.
+    """
+    raw = f"{ticker}|{years}|{last_bar:%Y-%m-%d}|{model_hash}|{seq_length}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def run_id_for(ticker, years, close) -> str:
+    return make_run_id(
+        ticker,
+        years,
+        close.index[-1],
+        registry.model_hash(),
+        settings.ML_SEQUENCE_LENGTH,
+    )
+
+
+def get_result(run_id):
+    """Cached ``perform_prediction`` result, or None on miss."""
+    result = caches["predictions"].get(f"prediction:{run_id}")
+    if result is None:
+        return None
+
+    # The persisted series backs the plots and may have been cleaned up
+    if not series_path(run_id).exists():
+        return None
+    return result
+
+
+def set_result(run_id, result):
+    caches["predictions"].set(f"prediction:{run_id}", result)
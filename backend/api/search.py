@@ -0,0 +1,338 @@
+# api/search.py
+"""
+Indexed full-text and fuzzy search for the list endpoints.
+
+``IndexedSearchFilter`` replaces DRF's ``SearchFilter`` (``?search=``) for
+models registered in ``INDEXES``; anything else, and databases other than
+PostgreSQL and SQLite, fall back to the usual ``icontains`` lookups.
+
+Both backends match the same rows: every query word found as a word in
+the text columns (``columns``), or the query word-similar to the short
+columns (``fuzzy``) or the related username, or every query word found
+inside an identifier column (``contains``, plain ``icontains`` as before,
+so "2023" still finds "S2023001"). Typos are only forgiven in the short
+columns.
+
+- PostgreSQL: a GIN index on ``to_tsvector(...)`` of the text columns for
+  ranked full-text matches, and a ``pg_trgm`` GIN index on the short
+  columns for typo-tolerant matches (``<%``, word similarity).
+- SQLite (local stand-in): an FTS5 table with the trigram tokenizer, kept
+  in sync by triggers. Candidates are rows sharing a trigram with the
+  query; Python ports of ``word_similarity`` and the tsquery word match
+  (without stemming) decide which are kept and how they rank.
+
+The DDL is generated here next to the queries (``create_sql``/``drop_sql``)
+and frozen into migrations as literal statements.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+# pg_trgm's default for <% (pg_trgm.word_similarity_threshold), mirrored on SQLite
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    table: str
+    columns: list[str]  # full-text, most important first
+    fuzzy: list[str]  # short columns also matched by trigram similarity
+    contains: list[str] = field(default_factory=list)  # substring-matched IDs
+    config: str = "simple"  # PostgreSQL text search configuration
+    user_fk: str | None = None  # also match the related user's username
+    user_table: str = "students_userprofile"
+
+    @property
+    def fts_table(self):
+        return f"{self.table}_search"
+
+    def document(self, columns) -> str:
+        return " || ' ' || ".join(
+            f'coalesce("{self.table}"."{c}", \'\')' for c in columns
+        )
+
+    def vector(self) -> str:
+        parts = [
+            f"setweight(to_tsvector('{self.config}', "
+            f"coalesce(\"{self.table}\".\"{c}\", '')), '{w}')"
+            for c, w in zip(self.columns, "ABCD")
+        ]
+        return " || ".join(parts)
+
+
+INDEXES = {
+    "students.Student": SearchIndex(
+        table="students_student",
+        columns=["name", "student_id", "branch"],
+        fuzzy=["name", "student_id", "branch"],
+        contains=["student_id"],
+        user_fk="creator_id",
+    ),
+    "blogs.Article": SearchIndex(
+        table="blogs_article",
+        columns=["title", "content"],
+        fuzzy=["title"],  # trigram-indexing whole articles isn't worth it
+        config="english",
+    ),
+}
+
+
+# --- Similarity (SQLite) ---
+
+
+def _trigrams(word):
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def word_similarity(query, text) -> float:
+    """
+    Share of the query's trigrams found in the best-matching words of
+    ``text``; close to pg_trgm's ``word_similarity(query, text)``.
+    """
+    words = [_trigrams(w) for w in _WORD_RE.findall((query or "").lower())]
+    total = sum(len(t) for t in words)
+    if not total or not text:
+        return 0.0
+    doc = [_trigrams(w) for w in set(_WORD_RE.findall(text.lower()))]
+    matched = sum(max((len(q & d) for d in doc), default=0) for q in words)
+    return matched / total
+
+
+def words_match(query, text) -> bool:
+    """
+    Every word of ``query`` is a word of ``text``; ``websearch_to_tsquery``'s
+    AND of the words, without stemming or stop words.
+    """
+    words = set(_WORD_RE.findall((query or "").lower()))
+    return bool(words) and words <= set(_WORD_RE.findall((text or "").lower()))
+
+
+def register_sqlite_functions(sender, connection, **kwargs):
+    """``connection_created`` receiver: SQL access to the functions above."""
+    if connection.vendor == "sqlite":
+        for func in [word_similarity, words_match]:
+            connection.connection.create_function(
+                func.__name__, 2, func, deterministic=True
+            )
+
+
+def _fts_match(terms):
+    """FTS5 query matching rows that share any trigram with ``terms``."""
+    grams = {
+        word[i : i + 3]
+        for word in _WORD_RE.findall(terms.lower())
+        for i in range(len(word) - 2)
+    }
+    return " OR ".join(f'"{g}"' for g in sorted(grams))
+
+
+# --- Queries ---
+
+
+def search(queryset, index: SearchIndex, terms: str):
+    """
+    ``queryset`` narrowed to rows matching ``terms`` and annotated with
+    ``search_rank`` (higher is better). None if this database can't use the
+    index, so the caller can fall back.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        return _search_postgresql(queryset, index, terms)
+    if vendor == "sqlite":
+        return _search_sqlite(queryset, index, terms)
+    return None
+
+
+def _contains(index, terms):
+    """Every word of ``terms`` inside one of the ``contains`` columns."""
+    words = terms.split()
+    if not index.contains or not words:
+        return Q(pk__in=[])
+    return reduce(
+        and_,
+        (
+            reduce(or_, (Q(**{f"{c}__icontains": w}) for c in index.contains))
+            for w in words
+        ),
+    )
+
+
+def _search_postgresql(queryset, index, terms):
+    tsquery = f"websearch_to_tsquery('{index.config}', %s)"
+    fuzzy = index.document(index.fuzzy)
+    # <%% is pg_trgm's <% ("is word-similar"), escaped for the driver
+    where = f"({index.vector()}) @@ {tsquery} OR %s <%% ({fuzzy})"
+    params = [terms, terms]
+    if index.user_fk:
+        where += (
+            f' OR "{index.table}"."{index.user_fk}" IN '
+            f'(SELECT id FROM "{index.user_table}" WHERE %s <%% username)'
+        )
+        params.append(terms)
+
+    rank = RawSQL(
+        f"ts_rank({index.vector()}, {tsquery}) + word_similarity(%s, {fuzzy})",
+        [terms, terms],
+        output_field=FloatField(),
+    )
+    matches = RawSQL(where, params, output_field=BooleanField())
+    return queryset.filter(matches | _contains(index, terms)).annotate(search_rank=rank)
+
+
+def _search_sqlite(queryset, index, terms):
+    match = _fts_match(terms)
+    if not match:
+        return None  # only words under three letters: no trigrams to look up
+
+    def document(columns):
+        return " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+
+    fts, fuzzy = index.fts_table, document(index.fuzzy)
+    # Same conditions as the PostgreSQL WHERE, on the FTS candidates
+    where = (
+        f"{fts} MATCH %s AND (words_match(%s, {document(index.columns)}) "
+        f"OR word_similarity(%s, {fuzzy}) >= %s"
+    )
+    params = [match, terms, terms, WORD_SIMILARITY_THRESHOLD]
+    if index.user_fk:
+        where += " OR word_similarity(%s, username) >= %s"
+        params += [terms, WORD_SIMILARITY_THRESHOLD]
+    candidates = RawSQL(f"SELECT rowid FROM {fts} WHERE {where})", params)
+
+    # words_match (0 or 1) stands in for ts_rank
+    rank = RawSQL(
+        f"(SELECT words_match(%s, {document(index.columns)}) + "
+        f"word_similarity(%s, {fuzzy}) FROM {fts} "
+        f'WHERE rowid = "{index.table}"."id")',
+        [terms, terms],
+        output_field=FloatField(),
+    )
+    matches = Q(pk__in=candidates) | _contains(index, terms)
+    return queryset.filter(matches).annotate(search_rank=rank)
+
+
+class IndexedSearchFilter(filters.SearchFilter):
+    """``?search=`` through the search index, ranked; see the module docstring."""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = " ".join(self.get_search_terms(request))
+        index = INDEXES.get(queryset.model._meta.label)
+        if terms and index is not None:
+            results = search(queryset, index, terms)
+            if results is not None:
+                return results
+        return super().filter_queryset(request, queryset, view)
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """Best search matches first unless the client picked an ``?ordering=``."""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        searched = "search_rank" in queryset.query.annotations
+        if searched and not request.query_params.get(self.ordering_param):
+            return ["-search_rank", *(ordering or [])]
+        return ordering
+
+
+# --- Index DDL ---
+# Migrations carry frozen copies of these statements. After changing
+# INDEXES, add a migration with the new output and point
+# SearchMigrationTests at it.
+
+
+def create_sql(label, vendor) -> list[str]:
+    index = INDEXES[label]
+    if vendor == "postgresql":
+        return ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + list(
+            _postgresql_indexes(index).values()
+        )
+    if vendor == "sqlite":
+        return _sqlite_table(index) + list(_sqlite_triggers(index).values())
+    return []
+
+
+def drop_sql(label, vendor) -> list[str]:
+    """Drops exactly what ``create_sql`` creates (the extension stays)."""
+    index = INDEXES[label]
+    if vendor == "postgresql":
+        return [f"DROP INDEX IF EXISTS {name}" for name in _postgresql_indexes(index)]
+    if vendor == "sqlite":
+        statements = [
+            f"DROP TRIGGER IF EXISTS {name}" for name in _sqlite_triggers(index)
+        ]
+        statements.append(f"DROP TABLE IF EXISTS {index.fts_table}")
+        return statements
+    return []
+
+
+def _postgresql_indexes(index) -> dict[str, str]:
+    """CREATE INDEX statements by index name."""
+    indexes = {
+        f"{index.table}_vector_idx": f'ON "{index.table}" '
+        f"USING gin (({index.vector()}))",
+        f"{index.table}_trgm_idx": f'ON "{index.table}" '
+        f"USING gin (({index.document(index.fuzzy)}) gin_trgm_ops)",
+    }
+    if index.user_fk:
+        indexes[f"{index.user_table}_username_trgm_idx"] = (
+            f'ON "{index.user_table}" USING gin (username gin_trgm_ops)'
+        )
+    return {
+        name: f"CREATE INDEX IF NOT EXISTS {name} {target}"
+        for name, target in indexes.items()
+    }
+
+
+def _sqlite_values(index, row):
+    """FTS column names and the expressions filling them from ``row``."""
+    values = {c: f"{row}.{c}" for c in index.columns}
+    if index.user_fk:
+        user = f"{row}.{index.user_fk}"
+        values["username"] = (
+            f"(SELECT username FROM {index.user_table} WHERE id = {user})"
+        )
+    return values
+
+
+def _sqlite_table(index):
+    fts = index.fts_table
+    backfill = _sqlite_values(index, "t")
+    names = ", ".join(backfill)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, tokenize='trigram')",
+        f"INSERT INTO {fts}(rowid, {names}) "
+        f"SELECT t.id, {', '.join(backfill.values())} FROM {index.table} t",
+    ]
+
+
+def _sqlite_triggers(index) -> dict[str, str]:
+    """CREATE TRIGGER statements keeping the FTS table in sync, by name."""
+    fts, table = index.fts_table, index.table
+    values = _sqlite_values(index, "new")
+    names, new = ", ".join(values), ", ".join(values.values())
+    insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});"
+    delete = f"DELETE FROM {fts} WHERE rowid = old.id;"
+
+    triggers = {
+        f"{fts}_ai": f"AFTER INSERT ON {table} BEGIN {insert} END",
+        f"{fts}_au": f"AFTER UPDATE ON {table} BEGIN {delete} {insert} END",
+        f"{fts}_ad": f"AFTER DELETE ON {table} BEGIN {delete} END",
+    }
+    if index.user_fk:
+        triggers[f"{fts}_user_au"] = (
+            f"AFTER UPDATE OF username ON {index.user_table} "
+            f"BEGIN UPDATE {fts} SET username = new.username WHERE rowid IN "
+            f"(SELECT id FROM {table} WHERE {index.user_fk} = new.id); END"
+        )
+    return {name: f"CREATE TRIGGER {name} {body}" for name, body in triggers.items()}
@@ -1,6 +1,10 @@
+from django.conf import settings
 from rest_framework import serializers
+
 from students.models import Student
 
+from .models import PredictionJob, TickerAccuracy
+
 
 class StudentSerializer(serializers.ModelSerializer):
     creator_username = serializers.SerializerMethodField()
@@ -22,3 +26,80 @@ class TickerSerializer(serializers.Serializer):
 
     # We expect a field named 'ticker' which is a string.
     ticker = serializers.CharField(max_length=10, required=True)
+
+
+class TickerListSerializer(serializers.Serializer):
+    """
+    Serializer for a batch of ticker symbols (watchlists, dashboards).
+    """
+
+    # No length limit per entry: the view reports bad symbols per ticker
+    tickers = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=settings.ML_BATCH_MAX_TICKERS,
+    )
+    horizon = serializers.IntegerField(
+        default=1, min_value=1, max_value=settings.ML_MAX_HORIZON
+    )
+
+    def validate_tickers(self, value):
+        # Normalise and drop duplicates while keeping the caller's order
+        return list(dict.fromkeys(t.upper().strip() for t in value))
+
+
+class PredictionJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.UUIDField(source="id", read_only=True)
+
+    class Meta:
+        model = PredictionJob
+        fields = [
+            "job_id",
+            "ticker",
+            "trading_day",
+            "status",
+            "result",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+
+class TickerAccuracySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TickerAccuracy
+        fields = [
+            "ticker",
+            "rmse",
+            "mse",
+            "r2",
+            "as_of",
+            "years",
+            "model_hash",
+            "evaluated_at",
+        ]
+
+
+class ForecastQuerySerializer(serializers.Serializer):
+    """
+    Query parameters for the next-day endpoint.
+    """
+
+    # Business days to forecast; 1 is the classic next-day prediction
+    horizon = serializers.IntegerField(
+        default=1, min_value=1, max_value=settings.ML_MAX_HORIZON
+    )
+
+
+class SeriesQuerySerializer(serializers.Serializer):
+    """
+    Query parameters for the chart-data endpoint.
+    """
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    # Downsample to roughly this many points (LTTB); omit for full resolution
+    points = serializers.IntegerField(required=False, min_value=3, max_value=20000)
+    # Not "format": DRF reserves that for renderer negotiation
+    payload = serializers.ChoiceField(choices=["json", "binary"], default="json")
@@ -0,0 +1,142 @@
+# api/streaming.py
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import StreamingHttpResponse
+
+NDJSON = "application/x-ndjson"
+SSE = "text/event-stream"
+
+logger = logging.getLogger(__name__)
+
+
+def encode_event(name, data, content_type) -> str:
+    if content_type == NDJSON:
+        return json.dumps({"event": name, **data}, default=str) + "\n"
+    return f"event: {name}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class Run:
+    """
+    One execution of ``work(emit)`` in a daemon thread. Its events are kept
+    so any number of streams can follow it, each from the first event.
+    """
+
+    def __init__(self, work):
+        self.events = []  # (name, data, elapsed_ms)
+        self.done = False
+        self._cond = threading.Condition()
+        self._started = time.perf_counter()
+        self._work = work
+
+    def start(self, on_done=None):
+        def run():
+            try:
+                self.emit("result", **self._work(self.emit))
+            except ValueError as e:
+                self.emit("error", error=str(e))  # bad ticker, not enough data...
+            except Exception as e:
+                logger.exception("Streamed run failed")
+                self.emit("error", error=str(e))
+            finally:
+                with self._cond:
+                    self.done = True
+                    self._cond.notify_all()
+                if on_done is not None:
+                    on_done(self)
+                close_old_connections()
+
+        threading.Thread(target=run, name="event-stream", daemon=True).start()
+        return self
+
+    def emit(self, name, **data):
+        elapsed_ms = round((time.perf_counter() - self._started) * 1000, 1)
+        with self._cond:
+            self.events.append((name, data, elapsed_ms))
+            self._cond.notify_all()
+
+    def follow(self, timeout):
+        """Every event so far, then new ones; None after ``timeout`` idle seconds."""
+        seen = 0
+        while True:
+            with self._cond:
+                if seen == len(self.events) and not self.done:
+                    self._cond.wait(timeout)
+                new, done = self.events[seen:], self.done
+            seen += len(new)
+            if not new and not done:
+                yield None
+            yield from new
+            if done:
+                return
+
+
+_runs: dict[tuple, Run] = {}
+_runs_lock = threading.Lock()
+
+
+def start_run(work, key=None) -> tuple[Run, bool]:
+    """
+    Start ``work``, or return the run already in flight under ``key``.
+
+    Returns ``(run, created)``. A run leaves the registry when it finishes,
+    so a later call with the same key starts over.
+    """
+    if key is None:
+        return Run(work).start(), True
+
+    def forget(run):
+        with _runs_lock:
+            if _runs.get(key) is run:
+                del _runs[key]
+
+    with _runs_lock:
+        run = _runs.get(key)
+        if run is not None:
+            return run, False
+        run = _runs[key] = Run(work)
+    return run.start(on_done=forget), True
+
+
+def iter_events(work, content_type, heartbeat=None, key=None, present=None):
+    """
+    Run ``work(emit)`` in a thread and yield what it emits, encoded.
+
+    ``emit(name, **data)`` queues one event. ``work``'s return value is sent
+    as a final ``result`` event (through ``present`` if given), an exception
+    as ``error``. While nothing happens a ``heartbeat`` event goes out every
+    ``heartbeat`` seconds so proxies and clients don't give up on a long run.
+
+    Streams started with the same ``key`` while a run is in flight follow
+    that run instead of starting another one; a client that reconnects gets
+    its earlier events replayed and then the rest.
+    """
+    heartbeat = heartbeat or settings.ML_STREAM_HEARTBEAT_SECONDS
+    run, _ = start_run(work, key)
+    for event in run.follow(heartbeat):
+        if event is None:
+            yield encode_event("heartbeat", {}, content_type)
+            continue
+        name, data, elapsed_ms = event
+        if name == "result" and present is not None:
+            data = present(data)
+        yield encode_event(name, {**data, "elapsed_ms": elapsed_ms}, content_type)
+
+
+def event_stream_response(request, work, key=None, present=None):
+    """
+    Stream ``work``'s events as NDJSON if the client asks for it, else SSE.
+    ``key`` and ``present`` are passed on to ``iter_events``.
+    """
+    content_type = NDJSON if NDJSON in request.headers.get("Accept", "") else SSE
+    response = StreamingHttpResponse(
+        iter_events(work, content_type, key=key, present=present),
+        content_type=content_type,
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: flush each event
+    return response
@@ -1,3 +1,1578 @@
-from django.test import TestCase
+import json
+import os
+import re
+import subprocess
+import sys
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+# Heavy imports that only the stock prediction endpoints need
+ML_MODULES = [
+    "tensorflow",
+    "keras",
+    "pandas",
+    "sklearn",
+    "matplotlib",
+    "seaborn",
+    "yfinance",
+]
+
+# Boots Django and resolves a CRUD route, the way a fresh worker would
+CRUD_WORKER_PROBE = """
+import json, sys, time
+
+started = time.perf_counter()
+import django
+
+django.setup()
+from django.urls import resolve
+
+resolve("/api/v1/students/")
+
+# Linux VmHWM resets on exec; ru_maxrss would include the forked test runner
+try:
+    with open("/proc/self/status") as fh:
+        status = dict(line.split(":", 1) for line in fh)
+    rss_kb = int(status["VmHWM"].split()[0])
+except OSError:
+    import resource
+
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "rss_mb": rss_kb / 1024,
+    "modules": sorted(set(sys.modules)),
+}))
+"""
+
+
+class CrudImportPathTests(SimpleTestCase):
+    """The ML stack must stay out of workers that only serve CRUD routes."""
+
+    STARTUP_BUDGET_SECONDS = 5
+    RSS_BUDGET_MB = 150  # TensorFlow alone is several times this
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": "django_rest_main.settings"}
+        output = subprocess.run(
+            [sys.executable, "-c", CRUD_WORKER_PROBE],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        cls.probe = json.loads(output.strip().splitlines()[-1])
+
+    def test_ml_modules_not_imported(self):
+        loaded = {name.split(".")[0] for name in self.probe["modules"]}
+        self.assertEqual(sorted(loaded & set(ML_MODULES)), [])
+
+    def test_startup_time(self):
+        self.assertLess(self.probe["seconds"], self.STARTUP_BUDGET_SECONDS)
+
+    def test_peak_rss(self):
+        self.assertLess(self.probe["rss_mb"], self.RSS_BUDGET_MB)
+
+
+class RunningMetricsTests(SimpleTestCase):
+    def test_chunked_metrics_match_sklearn(self):
+        import numpy as np
+        from sklearn.metrics import mean_squared_error, r2_score
+
+        from api.backtest import RunningMetrics
+        from api.providers import synthetic_close
+
+        # Large price level, small spread: where a naive sum-of-squares R² drifts
+        actual = synthetic_close(days=2600).to_numpy() + 1e6
+        predicted = actual + np.random.default_rng(1).normal(0, 2, actual.size)
+
+        metrics = RunningMetrics()
+        for chunk in [slice(0, 1), slice(1, 1), slice(1, 700), slice(700, None)]:
+            metrics.update(actual[chunk], predicted[chunk])
+
+        mse = mean_squared_error(actual, predicted)
+        self.assertEqual(metrics.count, actual.size)
+        self.assertAlmostEqual(metrics.mse, mse, places=8)
+        self.assertAlmostEqual(metrics.rmse, np.sqrt(mse), places=8)
+        self.assertAlmostEqual(metrics.r2, r2_score(actual, predicted), places=8)
+
+    def test_flat_series_r2_is_json_safe(self):
+        import numpy as np
+
+        from api.backtest import RunningMetrics
+
+        metrics = RunningMetrics()
+        metrics.update(np.full(10, 5.0), np.full(10, 5.5))
+        self.assertEqual(metrics.as_dict(), {"mse": 0.25, "rmse": 0.5, "r2": None})
+        json.dumps(metrics.as_dict(), allow_nan=False)
+
+    def test_windows_need_more_rows_than_the_sequence(self):
+        import numpy as np
+
+        from api.backtest import sliding_windows
+
+        self.assertEqual(sliding_windows(np.arange(101.0), 100).shape, (1, 100, 1))
+        for rows in [50, 100]:
+            with self.assertRaisesMessage(ValueError, "Not enough data"):
+                sliding_windows(np.arange(float(rows)), 100)
+
+    def test_empty_is_nan(self):
+        import math
+
+        from api.backtest import RunningMetrics
+
+        metrics = RunningMetrics()
+        self.assertTrue(math.isnan(metrics.mse))
+        self.assertTrue(math.isnan(metrics.r2))
+
+
+class BenchmarkCompareTests(SimpleTestCase):
+    def test_flags_only_regressions_past_threshold(self):
+        from api.management.commands.benchmark_predictions import compare
+
+        baseline = {
+            "inference": {"median_ms": 100.0, "py_heap_peak_kb": 1000.0},
+            "scaling": {"median_ms": 0.2, "py_heap_peak_kb": 10.0},
+        }
+        current = {
+            "inference": {"median_ms": 130.0, "py_heap_peak_kb": 1100.0},
+            "scaling": {"median_ms": 0.5, "py_heap_peak_kb": 10.0},  # under min_ms
+            "new_phase": {"median_ms": 5.0, "py_heap_peak_kb": 1.0},  # not in baseline
+        }
+        regressions = compare(current, baseline, threshold=0.2, min_ms=1.0)
+        self.assertEqual(regressions, ["inference: 100.00 ms -> 130.00 ms"])
+
+    def test_phase_memory_excludes_earlier_allocations(self):
+        import tracemalloc
+
+        from api.management.commands.benchmark_predictions import PhaseTimer
+
+        timer = PhaseTimer()
+        tracemalloc.start()
+        try:
+            held = bytearray(8 * 1024 * 1024)
+            timer.tracing = True
+            with timer.phase("big"):
+                bytearray(4 * 1024 * 1024)
+            with timer.phase("small"):
+                bytearray(256 * 1024)
+        finally:
+            tracemalloc.stop()
+        del held
+
+        timer.tracing = False
+        for name in ["big", "small"]:
+            with timer.phase(name):
+                pass
+        summary = timer.summary()
+        self.assertAlmostEqual(summary["big"]["py_heap_peak_kb"], 4096, delta=64)
+        self.assertAlmostEqual(summary["small"]["py_heap_peak_kb"], 256, delta=64)
+
+    def test_record_saves_fixtures_from_the_live_provider(self):
+        import tempfile
+        from io import StringIO
+        from pathlib import Path
+        from unittest import mock
+
+        from api.management.commands import benchmark_predictions
+        from api.providers import FileProvider, synthetic_close
+
+        live = mock.Mock()
+        live.download_closes.return_value = {"MSFT": synthetic_close(days=300)}
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            mock.patch.object(benchmark_predictions, "get_provider", return_value=live),
+        ):
+            command = benchmark_predictions.Command(stdout=StringIO())
+            command._record(["MSFT"], Path(tmp), years=1)
+            self.assertEqual(len(FileProvider(tmp).load("MSFT")), 300)
+
+            with self.assertRaisesMessage(Exception, "No prices downloaded for NOPE"):
+                command._record(["NOPE"], Path(tmp), years=1)
+
+
+class EventStreamTests(SimpleTestCase):
+    def test_events_heartbeat_and_result(self):
+        import time
+
+        from api.streaming import NDJSON, iter_events
+
+        def work(emit):
+            emit("data_load", rows=3)
+            time.sleep(0.3)
+            return {"ok": True}
+
+        lines = list(iter_events(work, NDJSON, heartbeat=0.1))
+        events = [json.loads(line)["event"] for line in lines]
+        self.assertEqual(events[0], "data_load")
+        self.assertIn("heartbeat", events)
+        self.assertEqual(events[-1], "result")
+        self.assertTrue(json.loads(lines[-1])["ok"])
+
+    def test_unexpected_errors_are_logged(self):
+        from api.streaming import NDJSON, iter_events
+
+        def fail(error):
+            def work(emit):
+                raise error
+
+            return work
+
+        with self.assertLogs("api.streaming", "ERROR") as logs:
+            lines = list(iter_events(fail(RuntimeError("boom")), NDJSON))
+            list(iter_events(fail(ValueError("No data found")), NDJSON))
+        last = json.loads(lines[-1])
+        self.assertEqual((last["event"], last["error"]), ("error", "boom"))
+        self.assertEqual(len(logs.records), 1)  # expected errors aren't logged
+
+    def test_streams_with_one_key_share_a_run(self):
+        import threading
+
+        from api.streaming import NDJSON, iter_events
+
+        calls, release = [], threading.Event()
+
+        def work(emit):
+            calls.append(1)
+            emit("data_load", rows=3)
+            release.wait(5)
+            return {"n": len(calls)}
+
+        key = ("prediction", "MSFT", "2026-10-16")
+        first = iter_events(work, NDJSON, heartbeat=5, key=key)
+        self.assertEqual(json.loads(next(first))["event"], "data_load")
+        # A second (or reconnecting) client replays the run so far
+        second = iter_events(work, NDJSON, heartbeat=5, key=key, present=dict.copy)
+        self.assertEqual(json.loads(next(second))["event"], "data_load")
+        release.set()
+        self.assertEqual(json.loads(next(first))["n"], 1)
+        self.assertEqual(json.loads(next(second))["n"], 1)
+        self.assertEqual(len(calls), 1)
+
+        # Finished runs are forgotten: the next stream starts over
+        lines = list(iter_events(work, NDJSON, heartbeat=5, key=key))
+        self.assertEqual(json.loads(lines[-1])["n"], 2)
+
+
+class PredictionRequestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from django.contrib.auth import get_user_model
+
+        cls.user = get_user_model().objects.create_user(
+            "analyst", "analyst@example.com", "pw"
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_unknown_ticker_is_not_enough_data(self):
+        from api.providers import synthetic_close
+
+        use_offline_prices(self, {"MSFT": synthetic_close(days=300)})
+        response = self.client.get("/api/v1/predict/?ticker=NOPE", secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Not enough data for NOPE", response.json()["error"])
+
+        response = self.client.post(
+            "/api/v1/predict-stock/", {"ticker": "NOPE"}, secure=True
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "No data found for ticker: NOPE")
+
+    def test_short_history_is_not_enough_data(self):
+        from api.providers import synthetic_close
+
+        use_offline_prices(self, {"TINY": synthetic_close(days=50)})
+        response = self.client.post(
+            "/api/v1/predict-stock/", {"ticker": "TINY"}, secure=True
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["error"],
+            "Not enough data for TINY to form sequence of 100 days.",
+        )
+
+    def test_stream_rejects_invalid_ticker(self):
+        response = self.client.post(
+            "/api/v1/predict-stock/stream/", {"ticker": "MS FT!"}, secure=True
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid ticker", response.json()["error"])
+
+    def test_job_rejects_invalid_ticker(self):
+        from api.models import PredictionJob
+
+        response = self.client.post(
+            "/api/v1/predict-stock/jobs/", {"ticker": "../etc"}, secure=True
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid ticker", response.json()["error"])
+        self.assertFalse(PredictionJob.objects.exists())
+
+    def test_job_ticker_is_normalised(self):
+        response = self.client.post(
+            "/api/v1/predict-stock/jobs/", {"ticker": " msft "}, secure=True
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.json()["created"])
+        again = self.client.post(
+            "/api/v1/predict-stock/jobs/", {"ticker": "MSFT"}, secure=True
+        )
+        self.assertEqual(again.json()["job_id"], response.json()["job_id"])
+        self.assertFalse(again.json()["created"])
+
+    def test_overdue_job_is_failed(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from api.models import PredictionJob
+
+        job_id = self.client.post(
+            "/api/v1/predict-stock/jobs/", {"ticker": "MSFT"}, secure=True
+        ).json()["job_id"]
+        # As if the process running it was restarted long ago
+        PredictionJob.objects.filter(pk=job_id).update(
+            status="running", created_at=timezone.now() - timedelta(days=1)
+        )
+
+        detail = self.client.get(f"/api/v1/predict-stock/jobs/{job_id}/", secure=True)
+        self.assertEqual(detail.json()["status"], "failed")
+        self.assertEqual(detail.json()["error"], "Timed out")
+
+        retry = self.client.post(
+            "/api/v1/predict-stock/jobs/", {"ticker": "MSFT"}, secure=True
+        )
+        self.assertTrue(retry.json()["created"])
+
+
+@skipUnless(os.path.exists("/proc/self/status"), "needs Linux /proc")
+class PhaseMemoryTests(SimpleTestCase):
+    def test_peak_is_seen_after_memory_is_freed(self):
+        import numpy as np
+
+        from api.timing import RequestTimings, _current, phase, rss_bytes
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            with phase("inference"):
+                before = rss_bytes()
+                np.ones(64 * 1024 * 1024 // 8).sum()  # 64 MiB, freed at once
+                after = rss_bytes()
+        finally:
+            _current.reset(token)
+
+        ((_, _, growth),) = timings.phases
+        self.assertLess(after - before, 16 * 1024 * 1024)
+        self.assertGreater(growth, 48 * 1024 * 1024)
+
+
+class MetricsAccessTests(TestCase):
+    URL = "/api/v1/metrics/"
+
+    def test_anonymous_and_regular_users_are_refused(self):
+        from django.contrib.auth import get_user_model
+
+        self.assertEqual(self.client.get(self.URL, secure=True).status_code, 403)
+        user = get_user_model().objects.create_user("viewer", "v@example.com", "pw")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(self.URL, secure=True).status_code, 403)
+
+    def test_staff_session(self):
+        from django.contrib.auth import get_user_model
+
+        staff = get_user_model().objects.create_user(
+            "ops", "ops@example.com", "pw", is_staff=True
+        )
+        self.client.force_login(staff)
+        response = self.client.get(self.URL, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"process_resident_memory_bytes", response.content)
+
+    def test_bearer_token(self):
+        from django.test.utils import override_settings
+
+        with override_settings(ML_METRICS_TOKEN="s3cret"):
+            ok = self.client.get(
+                self.URL, secure=True, headers={"Authorization": "Bearer s3cret"}
+            )
+            wrong = self.client.get(
+                self.URL, secure=True, headers={"Authorization": "Bearer nope"}
+            )
+        self.assertEqual(ok.status_code, 200)
+        self.assertEqual(wrong.status_code, 403)
+        # No token configured: a bearer header alone never gets in
+        empty = self.client.get(
+            self.URL, secure=True, headers={"Authorization": "Bearer "}
+        )
+        self.assertEqual(empty.status_code, 403)
+
+
+class TickerInfoTests(TestCase):
+    def setUp(self):
+        from unittest import mock
+
+        from api import ticker_info
+
+        ticker_info._memo.clear()
+        self.addCleanup(ticker_info._memo.clear)
+        self.provider = mock.Mock()
+        self.provider.ticker_info.return_value = {"longName": "Microsoft Corp."}
+        for name, value in [
+            ("get_provider", lambda: self.provider),
+            ("_refresh_in_background", mock.Mock()),
+        ]:
+            patcher = mock.patch.object(ticker_info, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.ticker_info = ticker_info
+
+    def remember(self, refresh_in, name="Microsoft"):
+        import time
+
+        self.ticker_info._memo_put(
+            "MSFT", (time.time() + refresh_in, {"longName": name})
+        )
+
+    def test_fresh_hit_touches_nothing(self):
+        self.remember(refresh_in=60)
+        self.assertEqual(self.ticker_info.company_name("MSFT"), "Microsoft")
+        self.provider.ticker_info.assert_not_called()
+        self.ticker_info._refresh_in_background.assert_not_called()
+
+    def test_stale_hit_is_served_and_refreshed(self):
+        from api.models import TickerInfo
+
+        self.remember(refresh_in=-1)
+        self.assertEqual(self.ticker_info.company_name("MSFT"), "Microsoft")
+        self.ticker_info._refresh_in_background.assert_called_once_with("MSFT")
+
+        self.ticker_info._fetch("MSFT")  # what the background thread runs
+        self.assertEqual(self.ticker_info.company_name("MSFT"), "Microsoft Corp.")
+        self.assertEqual(TickerInfo.objects.get().long_name, "Microsoft Corp.")
+
+    def test_failed_refresh_keeps_the_stale_info(self):
+        import time
+
+        self.remember(refresh_in=-1)
+        self.provider.ticker_info.side_effect = ConnectionError("rate limited")
+        with self.assertLogs("api.ticker_info", "WARNING"):
+            refresh_after, info = self.ticker_info._fetch("MSFT")
+
+        self.assertEqual(info, {"longName": "Microsoft"})
+        self.assertGreater(refresh_after, time.time())
+        self.assertEqual(self.ticker_info.company_name("MSFT"), "Microsoft")
+        self.ticker_info._refresh_in_background.assert_not_called()  # not hot
+
+
+class PredictionOutputTests(TestCase):
+    RUN_ID = "0123456789abcdef0123456789abcdef"
+
+    def setUp(self):
+        from api.plots import save_series
+        from api.providers import synthetic_close
+
+        use_offline_prices(self, {})
+        close = synthetic_close(days=400)
+        self.predicted = close.to_numpy() * 1.01
+        save_series(self.RUN_ID, "MSFT", close.index, close.to_numpy(), self.predicted)
+        self.days = len(close)
+
+    def test_series_json_and_binary(self):
+        import numpy as np
+
+        url = f"/api/v1/predictions/{self.RUN_ID}/series/"
+        data = self.client.get(url, secure=True).json()
+        self.assertEqual(data["ticker"], "MSFT")
+        self.assertEqual(len(data["dates"]), self.days)
+
+        thinned = self.client.get(f"{url}?points=50", secure=True).json()
+        self.assertLessEqual(len(thinned["dates"]), 50)
+
+        response = self.client.get(f"{url}?payload=binary", secure=True)
+        self.assertEqual(response["Content-Type"], "application/octet-stream")
+        self.assertEqual(int(response["X-Series-Count"]), self.days)
+        self.assertEqual(len(response.content), 4 * 4 * self.days)  # 4 columns
+        predicted = np.frombuffer(response.content, "<f4")[
+            2 * self.days : 3 * self.days
+        ]
+        np.testing.assert_allclose(predicted, self.predicted, rtol=1e-6)
+
+        missing = self.client.get(
+            "/api/v1/predictions/" + "f" * 32 + "/series/", secure=True
+        )
+        self.assertEqual(missing.status_code, 404)
+
+    def test_series_share_the_plot_store_budget(self):
+        import os
+
+        from api import plots
+        from api.providers import synthetic_close
+
+        first = plots.series_path(self.RUN_ID)
+        os.utime(first, (1, 1))  # least recently used
+        plots.plot_store.max_bytes = int(first.stat().st_size * 2.5)
+
+        close = synthetic_close(days=400)
+        for run_id in ["1" * 32, "2" * 32]:
+            plots.save_series(run_id, "MSFT", close.index, close, close)
+        self.assertFalse(first.exists())
+        self.assertTrue(plots.series_path("2" * 32).exists())
+        with self.assertRaises(FileNotFoundError):
+            plots.load_series(self.RUN_ID)
+
+    def test_plot_is_rendered_then_revalidated(self):
+        url = f"/api/v1/plots/{self.RUN_ID}/residuals_plot.png"
+        response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"\x89PNG"))
+
+        cached = self.client.get(
+            url, secure=True, headers={"If-None-Match": response["ETag"]}
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    def test_unknown_run_is_404_even_with_a_matching_etag(self):
+        run_id = "f" * 32
+        response = self.client.get(
+            f"/api/v1/plots/{run_id}/residuals_plot.png",
+            secure=True,
+            headers={"If-None-Match": f'"{run_id}-residuals_plot"'},
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class CursorPaginationTests(TestCase):
+    def test_pages_stable_under_inserts(self):
+        from django.contrib.auth import get_user_model
+
+        from students.models import Student
+
+        user = get_user_model().objects.create_user(
+            "staff", "staff@example.com", "pw", is_staff=True
+        )
+        for i in range(5):
+            Student.objects.create(student_id=i, name=f"s{i}", branch="b", creator=user)
+        self.client.force_login(user)
+
+        seen = []
+        url = "/api/v1/students/?pagination=cursor&page_size=2"
+        while url:
+            body = self.client.get(url, secure=True).json()
+            self.assertNotIn("count", body)
+            seen += [row["name"] for row in body["results"]]
+            # A row created mid-way sorts before the cursor and is not served
+            Student.objects.get_or_create(
+                student_id="new", name="new", branch="b", creator=user
+            )
+            url = body["next"]
+
+        self.assertEqual(seen, [f"s{i}" for i in reversed(range(5))])
+
+
+class ListQueryPlanTests(TestCase):
+    """
+    EXPLAIN every query the hot list endpoints run and fail on a full table
+    scan or an explicit sort, i.e. a missing index. PostgreSQL is told to
+    avoid sequential scans, since with test-sized tables it would rightly
+    prefer them anyway.
+    """
+
+    TABLES = ["students_student", "blogs_article", "blogs_comment"]
+
+    @classmethod
+    def setUpTestData(cls):
+        from django.contrib.auth import get_user_model
+
+        from blogs.models import Article, Comment
+        from students.models import Student
+
+        User = get_user_model()
+        cls.user = User.objects.create_user("owner", "owner@example.com", "pw")
+        cls.staff = User.objects.create_user(
+            "staff", "staff@example.com", "pw", is_staff=True
+        )
+        for i in range(3):
+            Student.objects.create(
+                student_id=i, name=f"s{i}", branch="b", creator=cls.user
+            )
+            article = Article.objects.create(title=f"a{i}", creator=cls.user)
+            Comment.objects.create(article=article, content="c", creator=cls.user)
+        cls.article = article
+
+    def plan(self, sql) -> str:
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("EXPLAIN " + sql)
+                return "\n".join(row[0] for row in cursor.fetchall())
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            return "\n".join(row[-1] for row in cursor.fetchall())
+
+    def assert_indexed(self, user, url):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200, url)
+
+        tables = "|".join(self.TABLES)
+        for query in queries:
+            sql = query["sql"]
+            if not sql.startswith("SELECT") or not re.search(tables, sql):
+                continue
+            plan = self.plan(sql)
+            if connection.vendor == "postgresql":
+                bad = re.search(
+                    rf"Seq Scan on ({tables})\b|^\s*(->\s*)?Sort\b", plan, re.M
+                )
+            else:
+                bad = re.search(
+                    rf"SCAN ({tables})(?! USING)|TEMP B-TREE FOR ORDER BY", plan
+                )
+            self.assertIsNone(bad, f"{url}\n{sql}\n{plan}")
+
+    def test_student_lists(self):
+        for url in [
+            "/api/v1/students/",
+            "/api/v1/students/?pagination=cursor",
+            "/api/v1/students/?ordering=branch",
+        ]:
+            self.assert_indexed(self.user, url)
+            self.assert_indexed(self.staff, url)
+
+    def test_article_lists(self):
+        for url in [
+            "/api/v1/blogs/articles/",
+            "/api/v1/blogs/articles/?pagination=cursor",
+            "/api/v1/blogs/articles/?status=draft",
+        ]:
+            self.assert_indexed(self.user, url)
+
+    def test_comment_lists(self):
+        url = f"/api/v1/blogs/articles/{self.article.pk}/comments/"
+        self.assert_indexed(self.user, url)
+        self.assert_indexed(self.user, url + "?pagination=cursor")
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from django.contrib.auth import get_user_model
+
+        from blogs.models import Article
+        from students.models import Student
+
+        cls.user = get_user_model().objects.create_user(
+            "registrar", "registrar@example.com", "pw"
+        )
+        for name, branch in [
+            ("Alice Johnson", "Computer Science"),
+            ("Johnny Walker", "Mechanical"),
+            ("Bob Smith", "Civil"),
+        ]:
+            Student.objects.create(
+                student_id=name[:3], name=name, branch=branch, creator=cls.user
+            )
+        Article.objects.create(
+            title="Indexing tips", content="Trigram indexes help.", creator=cls.user
+        )
+
+    def names(self, query):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            f"/api/v1/students/?search={query}&page_size=10", secure=True
+        )
+        return [row["name"] for row in response.json()["results"]]
+
+    def test_typos_and_ranking(self):
+        self.assertEqual(self.names("Jonson"), ["Alice Johnson"])
+        self.assertEqual(self.names("computr"), ["Alice Johnson"])
+        self.assertEqual(self.names("john")[0], "Johnny Walker")
+        self.assertEqual(len(self.names("registrar")), 3)  # creator's username
+        self.assertEqual(self.names("zzzz"), [])
+
+    def test_student_id_substring(self):
+        from students.models import Student
+
+        Student.objects.create(
+            student_id="S2023001", name="Carol Diaz", branch="Civil", creator=self.user
+        )
+        self.assertEqual(self.names("2023"), ["Carol Diaz"])
+        self.assertEqual(self.names("s2023"), ["Carol Diaz"])
+
+    def test_index_follows_updates(self):
+        from students.models import Student
+
+        Student.objects.filter(name="Bob Smith").update(name="Robert Smith")
+        self.assertEqual(self.names("robert"), ["Robert Smith"])
+        Student.objects.filter(name="Robert Smith").delete()
+        self.assertEqual(self.names("smith"), [])
+
+    def titles(self, query):
+        response = self.client.get(
+            f"/api/v1/blogs/articles/?search={query}", secure=True
+        )
+        return [a["title"] for a in response.json()["results"]]
+
+    def test_article_content(self):
+        # Whole words anywhere, typos only in the title: same on every backend
+        self.assertEqual(self.titles("trigram"), ["Indexing tips"])
+        self.assertEqual(self.titles("trigram help"), ["Indexing tips"])
+        self.assertEqual(self.titles("indexng"), ["Indexing tips"])
+        self.assertEqual(self.titles("trigrm"), [])
+        self.assertEqual(self.titles("trigram nope"), [])
+
+
+class SearchMigrationTests(SimpleTestCase):
+    # The latest migration holding each model's frozen search DDL
+    MIGRATIONS = {
+        "students.Student": "students.migrations.0006_search_index",
+        "blogs.Article": "blogs.migrations.0004_search_index",
+    }
+
+    def test_frozen_sql_matches_index_specs(self):
+        from importlib import import_module
+
+        from api import search
+
+        for label, module in self.MIGRATIONS.items():
+            for op in import_module(module).Migration.operations:
+                with self.subTest(label=label, vendor=op.vendor):
+                    self.assertEqual(op.sql, search.create_sql(label, op.vendor))
+                    self.assertEqual(op.reverse_sql, search.drop_sql(label, op.vendor))
+
+
+class StudentBulkTests(TestCase):
+    url = "/api/v1/students/bulk/"
+
+    @classmethod
+    def setUpTestData(cls):
+        from django.contrib.auth import get_user_model
+
+        User = get_user_model()
+        cls.owner = User.objects.create_user("owner", "owner@example.com", "pw")
+        cls.staff = User.objects.create_user(
+            "staff", "staff@example.com", "pw", is_staff=True
+        )
+
+    def send(self, method, data, user=None):
+        self.client.force_login(user or self.owner)
+        return getattr(self.client, method)(
+            self.url, json.dumps(data), content_type="application/json", secure=True
+        )
+
+    def test_create_update_delete(self):
+        from students.models import Student
+
+        rows = [{"student_id": i, "name": f"s{i}", "branch": "cs"} for i in range(50)]
+        response = self.send("post", rows)
+        self.assertEqual(response.status_code, 201)
+        ids = [row["id"] for row in response.json()]
+        self.assertEqual(Student.objects.filter(creator=self.owner).count(), 50)
+
+        response = self.send("patch", [{"id": pk, "branch": "ee"} for pk in ids])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(Student.objects.values_list("branch", flat=True)), {"ee"})
+
+        self.assertEqual(self.send("delete", ids).status_code, 204)
+        self.assertFalse(Student.objects.exists())
+
+    def test_per_item_errors_write_nothing(self):
+        from students.models import Student
+
+        response = self.send(
+            "post", [{"name": "ok", "student_id": 1, "branch": "cs"}, {}]
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("name", errors[1])
+        self.assertFalse(Student.objects.exists())
+
+        # Staff can see other people's students but not change them
+        mine = Student.objects.create(
+            student_id=1, name="a", branch="cs", creator=self.staff
+        )
+        theirs = Student.objects.create(
+            student_id=2, name="b", branch="cs", creator=self.owner
+        )
+        response = self.send(
+            "patch",
+            [{"id": mine.pk, "name": "x"}, {"id": theirs.pk, "name": "x"}, {"id": 0}],
+            user=self.staff,
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("permission", errors[1]["id"][0])
+        self.assertEqual(errors[2], {"id": ["Not found."]})
+        self.assertFalse(Student.objects.filter(name="x").exists())
+
+
+def use_offline_prices(test, closes):
+    """
+    Serve ``closes`` ({ticker: Series}) through FileProvider fixtures, with
+    temporary price and plot stores, for the rest of ``test``.
+    """
+    import tempfile
+    from pathlib import Path
+    from unittest import mock
+
+    from django.test.utils import override_settings
+
+    from api import ml_utils, ml_views, next_day, plot_store, plots, price_store
+    from api.providers import FileProvider, get_provider
+
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    root = Path(tmp.name)
+    for ticker, close in closes.items():
+        FileProvider(root / "fixtures").save(ticker, close)
+
+    settings_override = override_settings(
+        ML_MARKET_DATA_PROVIDER="file",
+        ML_FIXTURES_DIR=root / "fixtures",
+        ML_DATA_DIR=root / "data",
+    )
+    settings_override.enable()
+    test.addCleanup(settings_override.disable)
+    get_provider.cache_clear()
+    test.addCleanup(get_provider.cache_clear)
+
+    store = price_store.PriceStore(root / "data" / "prices")
+    for module in [price_store, ml_utils, ml_views, next_day]:
+        patcher = mock.patch.object(module, "price_store", store)
+        patcher.start()
+        test.addCleanup(patcher.stop)
+    plots_store = plot_store.PlotStore(root / "data" / "plots")
+    for module in [plot_store, plots, ml_views]:
+        patcher = mock.patch.object(module, "plot_store", plots_store)
+        patcher.start()
+        test.addCleanup(patcher.stop)
+    next_day._states.clear()
+    test.addCleanup(next_day._states.clear)
+    return store
+
+
+def _installed(module):
+    import importlib.util
+
+    return importlib.util.find_spec(module) is not None
+
+
+@skipUnless(_installed("tensorflow"), "TensorFlow is not installed")
+@skipUnless(settings.ML_MODEL_PATH.exists(), "No model file")
+class TFLiteConversionTests(SimpleTestCase):
+    def test_shipped_model_converts_and_matches_keras(self):
+        import tempfile
+        from pathlib import Path
+
+        import numpy as np
+        from tensorflow.keras.models import load_model
+
+        from api.lite import TFLiteModel, convert
+
+        keras_model = load_model(settings.ML_MODEL_PATH)
+        windows = np.random.default_rng(0).random(
+            (3, settings.ML_SEQUENCE_LENGTH, 1), dtype="float32"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "model.float32.tflite"
+            path.write_bytes(convert(keras_model, "float32"))
+            lite_model = TFLiteModel(path)
+            expected = keras_model.predict(windows, verbose=0)
+            np.testing.assert_allclose(
+                lite_model.predict(windows[:1]), expected[:1], atol=1e-5
+            )
+            np.testing.assert_allclose(lite_model.predict(windows), expected, atol=1e-5)
+
+
+@skipUnless(_installed("tensorflow"), "TensorFlow is not installed")
+@skipUnless(settings.ML_MODEL_PATH.exists(), "No model file")
+class RecursiveForecastTests(SimpleTestCase):
+    def test_stepper_matches_model_predict(self):
+        import numpy as np
+        from tensorflow.keras.models import load_model
+
+        from api.forecast import LSTMStepper, recursive_forecast
+
+        model = load_model(settings.ML_MODEL_PATH)
+        windows = np.random.default_rng(0).random(
+            (2, settings.ML_SEQUENCE_LENGTH, 1), dtype="float32"
+        )
+        stepper = LSTMStepper.from_keras(model)
+        self.assertIsNotNone(stepper)
+        np.testing.assert_allclose(
+            stepper.predict(windows), model.predict(windows, verbose=0), atol=1e-5
+        )
+
+        class PredictOnly:  # no layers: takes the sliding model.predict path
+            def predict(self, batch, **kwargs):
+                return model.predict(batch, **kwargs)
+
+        stepped = recursive_forecast(model, windows, 5)
+        slid = recursive_forecast(PredictOnly(), windows, 5)
+        np.testing.assert_allclose(stepped[:, 0], slid[:, 0], atol=1e-5)
+
+        # Day k of the stepper == a full pass over the window plus k forecasts
+        for k in range(1, 5):
+            grown = np.concatenate([windows, stepped[:, :k, None]], axis=1)
+            np.testing.assert_allclose(
+                stepped[:, k], stepper.predict(grown)[:, 0], atol=1e-9
+            )
+
+
+@skipUnless(_installed("tensorflow"), "TensorFlow is not installed")
+@skipUnless(settings.ML_MODEL_PATH.exists(), "No model file")
+class NextDayEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from django.contrib.auth import get_user_model
+
+        cls.user = get_user_model().objects.create_user(
+            "watcher", "watcher@example.com", "pw"
+        )
+
+    def setUp(self):
+        from api.providers import synthetic_close
+
+        use_offline_prices(
+            self,
+            {
+                "MSFT": synthetic_close(days=600, seed=1),
+                "AAPL": synthetic_close(days=600, seed=2),
+                "TINY": synthetic_close(days=50, seed=3),
+            },
+        )
+        self.client.force_login(self.user)
+
+    def test_next_day(self):
+        response = self.client.get("/api/v1/predict/?ticker=msft", secure=True)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["ticker"], "MSFT")
+        self.assertGreater(data["predicted_price"], 0)
+
+    def test_batch_reports_bad_tickers_individually(self):
+        response = self.client.post(
+            "/api/v1/predict/batch/",
+            {"tickers": ["msft", "bad ticker!", "AAPL", "TINY", "NOPE", "MSFT"]},
+            content_type="application/json",
+            secure=True,
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(sorted(data["results"]), ["AAPL", "MSFT"])
+        self.assertEqual(sorted(data["errors"]), ["BAD TICKER!", "NOPE", "TINY"])
+        self.assertIn("Invalid ticker", data["errors"]["BAD TICKER!"])
+        self.assertIn("Not enough data", data["errors"]["TINY"])
+
+        single = self.client.get("/api/v1/predict/?ticker=MSFT", secure=True).json()
+        self.assertEqual(
+            data["results"]["MSFT"]["predicted_price"], single["predicted_price"]
+        )
+
+
+@skipUnless(_installed("tensorflow"), "TensorFlow is not installed")
+@skipUnless(settings.ML_MODEL_PATH.exists(), "No model file")
+class NextDayAsyncTests(TransactionTestCase):
+    # Not TestCase: the async view saves company info from a worker thread,
+    # which SQLite would block behind the test's open transaction
+
+    def setUp(self):
+        from api.providers import synthetic_close
+
+        use_offline_prices(
+            self,
+            {
+                "AAPL": synthetic_close(days=600, seed=2),
+                "TINY": synthetic_close(days=50, seed=3),
+            },
+        )
+
+    def test_async_view_matches_sync_view(self):
+        from asgiref.sync import async_to_sync
+
+        get = async_to_sync(self.async_client.get)
+        for query in ["ticker=aapl", "ticker=AAPL&horizon=5", "ticker=TINY"]:
+            with self.subTest(query=query):
+                response = get(f"/api/v1/predict/async/?{query}", secure=True)
+                sync = self.client.get(f"/api/v1/predict/?{query}", secure=True)
+                self.assertEqual(response.status_code, sync.status_code)
+                self.assertEqual(response.json(), sync.json())
+
+
+class PriceStoreTests(SimpleTestCase):
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+
+        from django.test.utils import override_settings
+
+        from api.price_store import PriceStore
+        from api.providers import FileProvider, get_provider, synthetic_close
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.fixtures = FileProvider(Path(tmp.name) / "fixtures")
+        self.close = synthetic_close(days=300)
+        settings_override = override_settings(
+            ML_MARKET_DATA_PROVIDER="file", ML_FIXTURES_DIR=self.fixtures.root
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        get_provider.cache_clear()
+        self.addCleanup(get_provider.cache_clear)
+        self.store = PriceStore(Path(tmp.name) / "prices")
+        self.start = self.close.index[0].date()
+
+    def expire(self, ticker="MSFT"):
+        """Pretend the last provider check was long ago."""
+        _, meta_path, _ = self.store._paths(ticker)
+        meta = json.loads(meta_path.read_text())
+        meta_path.write_text(json.dumps({**meta, "checked_at": 0}))
+
+    def test_incremental_refresh_overlaps_stored_bars(self):
+        from unittest import mock
+
+        import numpy as np
+
+        from api.providers import get_provider
+
+        self.fixtures.save("MSFT", self.close.iloc[:-10])
+        first = self.store.get_close("MSFT", self.start)
+        self.assertEqual(len(first), 290)
+
+        self.fixtures.save("MSFT", self.close)
+        # Within the refresh window nothing is fetched
+        self.assertEqual(len(self.store.get_close("MSFT", self.start)), 290)
+
+        self.expire()
+        provider = get_provider()
+        with mock.patch.object(
+            provider, "download_closes", wraps=provider.download_closes
+        ) as download:
+            merged = self.store.get_close("MSFT", self.start)
+        fetch_start = download.call_args.args[1]
+        self.assertEqual(fetch_start, first.index[-3].date())
+        self.assertTrue(merged.index.is_unique)
+        self.assertTrue((merged.index == self.close.index).all())
+        self.assertTrue(np.allclose(merged.to_numpy(), self.close.to_numpy()))
+
+    def test_last_bar_is_replaced_by_a_later_download(self):
+        partial = self.close.copy()
+        partial.iloc[-1] = 100.0
+        self.fixtures.save("MSFT", partial)
+        self.assertEqual(self.store.get_close("MSFT", self.start).iloc[-1], 100.0)
+
+        final = self.close.copy()
+        final.iloc[-1] = 105.0
+        self.fixtures.save("MSFT", final)
+        self.expire()
+        refreshed = self.store.get_close("MSFT", self.start)
+        self.assertEqual(refreshed.iloc[-1], 105.0)
+        self.assertEqual(len(refreshed), len(self.close))
+
+    def test_unknown_ticker_is_empty_and_remembered(self):
+        from unittest import mock
+
+        from api.providers import get_provider
+
+        self.fixtures.save("MSFT", self.close)
+        with mock.patch.object(
+            get_provider(), "download_closes", wraps=get_provider().download_closes
+        ) as download:
+            self.assertTrue(self.store.get_close("NOPE", self.start).empty)
+            self.assertTrue(self.store.get_close("NOPE", self.start).empty)
+        self.assertEqual(download.call_count, 1)  # not re-asked until it's stale
+
+    def test_bulk_refresh_downloads_each_range_separately(self):
+        from unittest import mock
+
+        from api.providers import get_provider
+
+        self.fixtures.save("MSFT", self.close)
+        self.fixtures.save("AAPL", self.close * 2)
+        self.store.get_close("MSFT", self.start)
+        self.expire()
+
+        provider = get_provider()
+        with mock.patch.object(
+            provider, "download_closes", wraps=provider.download_closes
+        ) as download:
+            closes = self.store.get_many(["MSFT", "AAPL"], self.start)
+        ranges = {tuple(c.args[0]): c.args[1] for c in download.mock_calls}
+        self.assertEqual(ranges[("AAPL",)], self.start)  # full history
+        self.assertEqual(ranges[("MSFT",)], self.close.index[-3].date())  # tail
+        self.assertEqual(len(closes["AAPL"]), len(self.close))
+
+    def test_backfill_earlier_history(self):
+        self.fixtures.save("MSFT", self.close)
+        later = self.close.index[100].date()
+        self.assertEqual(len(self.store.get_close("MSFT", later)), 200)
+        self.assertEqual(len(self.store.get_close("MSFT", self.start)), 300)
+
+
+class ProviderCoalescingTests(SimpleTestCase):
+    def setUp(self):
+        import tempfile
+        from unittest import mock
+
+        from api.providers import FileProvider, YFinanceProvider, synthetic_close
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.fixtures = FileProvider(tmp.name)
+        for seed, ticker in enumerate(["MSFT", "AAPL"]):
+            self.fixtures.save(ticker, synthetic_close(days=300, seed=seed))
+
+        # yf.download stand-in served from the fixtures
+        self.download = mock.Mock(side_effect=self.fixtures.download_closes)
+        patcher = mock.patch.object(YFinanceProvider, "_download", self.download)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.provider = YFinanceProvider(batch_window=0.2)
+
+    def fetch_concurrently(self, requests):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(len(requests)) as pool:
+            futures = [
+                pool.submit(self.provider.download_closes, *request)
+                for request in requests
+            ]
+            return [f.result() for f in futures]
+
+    def test_concurrent_requests_share_one_download_per_range(self):
+        from datetime import date, timedelta
+
+        today = date.today()
+        recent = (today - timedelta(days=30), today)
+        older = (today - timedelta(days=200), today - timedelta(days=100))
+        requests = [
+            (["MSFT"], *recent),
+            (["AAPL"], *older),
+            (["MSFT"], *recent),  # identical: attaches to the first
+            (["NOPE", "AAPL"], *recent),
+        ]
+        results = self.fetch_concurrently(requests)
+
+        # Same range: one download for all tickers; the older range apart
+        self.assertCountEqual(
+            [c.args for c in self.download.mock_calls],
+            [(["AAPL", "MSFT", "NOPE"], *recent), (["AAPL"], *older)],
+        )
+        for (tickers, start, end), result in zip(requests, results):
+            expected = self.fixtures.download_closes(tickers, start, end)
+            self.assertEqual(sorted(result), sorted(expected))
+            for ticker, close in expected.items():
+                self.assertTrue(result[ticker].equals(close))
+
+    def test_a_failed_download_fails_every_waiter(self):
+        from datetime import date
+
+        self.download.side_effect = ConnectionError("rate limited")
+        requests = [(["MSFT"], date(2020, 1, 1), date.today())] * 2
+        with self.assertRaisesMessage(ConnectionError, "rate limited"):
+            self.fetch_concurrently(requests)
+        self.assertEqual(self.download.call_count, 1)
+        # Nothing left in flight: the next request downloads again
+        self.download.side_effect = self.fixtures.download_closes
+        self.assertIn("MSFT", self.fetch_concurrently(requests)[0])
+        self.assertEqual(self.download.call_count, 2)
+
+
+class MicroBatcherTests(SimpleTestCase):
+    def setUp(self):
+        from unittest import mock
+
+        import numpy as np
+
+        # Row sums: every output row can be traced back to its input window
+        self.model = mock.Mock()
+        self.model.predict_on_batch.side_effect = lambda x: x.sum(axis=(1, 2))[
+            :, np.newaxis
+        ]
+
+    def start(self, window=0.3, max_rows=64):
+        import threading
+
+        from api.inference import MicroBatcher
+
+        batcher = MicroBatcher(lambda: self.model, window, max_rows)
+        # Blocks on its queue forever; the daemon thread dies with the test run
+        threading.Thread(target=batcher.serve_forever, daemon=True).start()
+        return batcher
+
+    def submit_concurrently(self, batcher, inputs):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(len(inputs)) as pool:
+            futures = [pool.submit(batcher.submit, x) for x in inputs]
+            return [f.result() for f in futures]
+
+    def windows(self, rows, seq_length=100, seed=0):
+        import numpy as np
+
+        return np.random.default_rng(seed).random((rows, seq_length, 1), "float32")
+
+    def test_requests_in_one_window_share_a_batch(self):
+        import numpy as np
+
+        inputs = [self.windows(2), self.windows(1, seed=1), self.windows(1, 50)]
+        outputs = self.submit_concurrently(self.start(), inputs)
+
+        shapes = sorted(c.args[0].shape for c in self.model.predict_on_batch.mock_calls)
+        self.assertEqual(shapes, [(1, 50, 1), (3, 100, 1)])  # one call per shape
+        for x, y in zip(inputs, outputs):
+            np.testing.assert_allclose(y, x.sum(axis=(1, 2))[:, np.newaxis])
+
+    def test_batches_close_at_max_rows(self):
+        inputs = [self.windows(1, seed=i) for i in range(4)]
+        self.submit_concurrently(self.start(window=1.0, max_rows=2), inputs)
+
+        rows = [c.args[0].shape[0] for c in self.model.predict_on_batch.mock_calls]
+        self.assertEqual(sum(rows), 4)
+        self.assertLessEqual(max(rows), 2)
+
+    def test_a_failed_batch_fails_each_request(self):
+        self.model.predict_on_batch.side_effect = RuntimeError("out of memory")
+        batcher = self.start()
+        with self.assertLogs("api.inference", "ERROR"):
+            with self.assertRaisesMessage(RuntimeError, "out of memory"):
+                self.submit_concurrently(batcher, [self.windows(1), self.windows(1)])
+
+
+class AccuracyLeaderboardTests(TestCase):
+    url = "/api/v1/predict/leaderboard/"
+
+    @classmethod
+    def setUpTestData(cls):
+        import datetime
+
+        from api.models import TickerAccuracy
+
+        for i, ticker in enumerate(["CCC", "AAA", "BBB", "DDD"]):
+            TickerAccuracy.objects.create(
+                ticker=ticker,
+                model_hash="new",
+                as_of=datetime.date(2026, 10, 16),
+                years=10,
+                mse=[4.0, 1.0, 1.0, 9.0][i],
+                rmse=[2.0, 1.0, 1.0, 3.0][i],
+                r2=[0.5, 0.9, None, 0.1][i],
+            )
+        TickerAccuracy.objects.create(
+            ticker="OLD",
+            model_hash="old",
+            as_of=datetime.date(2026, 10, 16),
+            years=10,
+            mse=0.0,
+            rmse=0.0,
+            r2=1.0,
+        )
+        # The newest evaluation picks the default model
+        TickerAccuracy.objects.filter(model_hash="old").update(
+            evaluated_at=datetime.datetime(2020, 1, 1, tzinfo=datetime.UTC)
+        )
+
+    def tickers(self, query=""):
+        response = self.client.get(f"{self.url}?{query}", secure=True)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_best_first_for_the_latest_model(self):
+        page = self.tickers()
+        self.assertEqual(page["count"], 4)
+        self.assertEqual(
+            [row["ticker"] for row in page["results"]], ["AAA", "BBB", "CCC", "DDD"]
+        )
+        self.assertEqual(page["results"][1]["r2"], None)
+
+    def test_ordering_and_pages(self):
+        page = self.tickers("ordering=-mse&page_size=2&page=2")
+        self.assertEqual(page["count"], 4)
+        self.assertEqual([row["ticker"] for row in page["results"]], ["AAA", "BBB"])
+        self.assertIsNone(page["next"])
+
+        page = self.tickers("model_hash=old")
+        self.assertEqual([row["ticker"] for row in page["results"]], ["OLD"])
+
+
+class LTTBTests(SimpleTestCase):
+    def test_downsampled_keeps_ends_and_peaks(self):
+        import numpy as np
+
+        from api.chart_data import lttb_indices
+
+        y = np.sin(np.linspace(0, 20, 5000))
+        y[1234] = 10  # a spike LTTB must not flatten away
+        for threshold in [3, 50, 999]:
+            with self.subTest(threshold=threshold):
+                indices = lttb_indices(np.arange(len(y)), y, threshold)
+                self.assertLessEqual(len(indices), threshold)
+                self.assertEqual((indices[0], indices[-1]), (0, len(y) - 1))
+                self.assertTrue(np.all(np.diff(indices) > 0))
+                self.assertIn(1234, indices)
+
+    def test_short_input_is_unchanged(self):
+        import numpy as np
+
+        from api.chart_data import lttb_indices
+
+        y = np.array([3.0, 1.0, 4.0, 1.0, 5.0])
+        for threshold in [5, 10]:
+            np.testing.assert_array_equal(
+                lttb_indices(np.arange(5), y, threshold), np.arange(5)
+            )
+
+
+class ResultCacheTests(SimpleTestCase):
+    def test_run_id_follows_last_bar_and_model(self):
+        import pandas as pd
+
+        from api.result_cache import make_run_id
+
+        day = pd.Timestamp("2026-10-16")
+        run_id = make_run_id("MSFT", 10, day, "hash-a", 100)
+        self.assertEqual(make_run_id("MSFT", 10, day, "hash-a", 100), run_id)
+        for changed in [
+            make_run_id("MSFT", 10, day + pd.Timedelta(days=1), "hash-a", 100),
+            make_run_id("MSFT", 10, day, "hash-b", 100),
+        ]:
+            self.assertNotEqual(changed, run_id)
+
+    def test_identical_request_is_served_from_cache(self):
+        from unittest import mock
+
+        from django.core.cache import caches
+
+        from api import ml_utils
+        from api.model_registry import registry
+        from api.providers import synthetic_close
+
+        use_offline_prices(self, {"MSFT": synthetic_close(days=300)})
+        caches["predictions"].clear()
+        self.addCleanup(caches["predictions"].clear)
+        model = mock.Mock()
+        model.predict_on_batch.side_effect = lambda batch: batch[:, -1, :]
+        with (
+            mock.patch.object(ml_utils, "get_model", return_value=model),
+            mock.patch.object(registry, "model_hash", return_value="h"),
+        ):
+            first = ml_utils.perform_prediction("MSFT", years=2)
+            calls = model.predict_on_batch.call_count
+            self.assertEqual(ml_utils.perform_prediction("msft", years=2), first)
+            self.assertEqual(model.predict_on_batch.call_count, calls)
+
+
+class ModelRegistryTests(SimpleTestCase):
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+        from unittest import mock
+
+        from api import model_registry
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "model.keras"
+        self.write(b"v1", mtime=1_000_000_000)
+
+        self.registry = model_registry.ModelRegistry()
+        load = mock.patch.object(
+            self.registry,
+            "_load",
+            side_effect=lambda path, signature, digest: model_registry.LoadedModel(
+                object(), path, signature, digest, loaded_at=0.0
+            ),
+        )
+        digest = mock.patch.object(
+            model_registry, "file_digest", wraps=model_registry.file_digest
+        )
+        self.load, self.digest = load.start(), digest.start()
+        self.addCleanup(mock.patch.stopall)
+
+    def write(self, data, mtime):
+        import os
+
+        self.path.write_bytes(data)
+        os.utime(self.path, (mtime, mtime))
+
+    def get(self):
+        return self.registry.get(self.path)
+
+    def test_unchanged_file_is_not_rehashed_or_reloaded(self):
+        first = self.get()
+        self.assertIs(self.get(), first)
+        self.assertEqual(self.digest.call_count, 1)
+        self.assertEqual(self.load.call_count, 1)
+
+    def test_replaced_file_is_reloaded(self):
+        first = self.get()
+        self.write(b"v2", mtime=1_000_000_001)
+        second = self.get()
+        self.assertIsNot(second, first)
+        self.assertNotEqual(second.digest, first.digest)
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_touched_file_with_same_bytes_is_not_reloaded(self):
+        first = self.get()
+        self.write(b"v1", mtime=1_000_000_001)
+        self.assertIs(self.get(), first)
+        self.assertEqual(self.digest.call_count, 2)
+        self.assertEqual(self.load.call_count, 1)
+
+
+class PlotStoreTests(SimpleTestCase):
+    def setUp(self):
+        import tempfile
+
+        from api.plot_store import PlotStore
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = PlotStore(tmp.name, max_bytes=1000)
+        self.clock = 1_000_000_000
+
+    def put(self, run_id, fill):
+        """Store a 300-byte plot, last used one tick after the previous one."""
+        import os
+
+        path = self.store.put(run_id, "loss", bytes([fill]) * 300)
+        self.clock += 1
+        os.utime(path, (self.clock, self.clock))
+        return path
+
+    def test_least_recently_used_is_evicted_past_the_budget(self):
+        first, second, third = self.put("a", 1), self.put("b", 2), self.put("c", 3)
+        self.assertEqual(self.store.get("a", "loss"), first)  # now most recent
+
+        fourth = self.put("d", 4)  # 1200 bytes: evict down to 900
+        self.assertIsNone(self.store.get("b", "loss"))
+        self.assertFalse(second.exists())
+        self.assertFalse(self.store.ref_path("b", "loss").exists())
+        for run_id, path in [("a", first), ("c", third), ("d", fourth)]:
+            self.assertEqual(self.store.get(run_id, "loss"), path)
+
+    def test_plot_over_the_budget_is_kept_until_the_next_put(self):
+        big = self.store.put("a", "loss", b"x" * 2000)
+        self.assertEqual(self.store.get("a", "loss"), big)
+
+        self.put("b", 1)
+        self.assertFalse(big.exists())
+        self.assertIsNone(self.store.get("a", "loss"))
+
+    def test_vanished_refs_are_skipped_when_pruning(self):
+        from pathlib import Path
+        from unittest import mock
+
+        self.put("a", 1)
+        read_text = Path.read_text
+
+        def vanish(path, *args, **kwargs):
+            if path.parent.parent.name == "refs":
+                raise FileNotFoundError(path)
+            return read_text(path, *args, **kwargs)
+
+        with mock.patch.object(Path, "read_text", vanish):
+            self.store._prune_refs()
+        self.assertIsNotNone(self.store.get("a", "loss"))
+
+    def test_identical_plots_are_stored_once(self):
+        self.assertEqual(self.put("a", 1), self.put("b", 1))
+        blobs = list((self.store.root / "blobs").rglob("*.png"))
+        self.assertEqual(len(blobs), 1)
+
+
+class NextDayStateTests(SimpleTestCase):
+    def setUp(self):
+        from api.providers import synthetic_close
+
+        self.close = synthetic_close(days=300)
+
+    def advance(self, state, new, cutoff=None):
+        import numpy as np
+
+        cutoff = cutoff or self.close.index[0]
+        return state.advance(new, np.datetime64(cutoff.date(), "D"))
+
+    def assertMatchesScaler(self, state, expected):
+        import numpy as np
+
+        self.assertEqual(list(state.dates), list(expected.index.values.astype("M8[D]")))
+        np.testing.assert_allclose(state.closes, expected.to_numpy())
+        self.assertEqual(state.low, expected.min())
+        self.assertEqual(state.high, expected.max())
+
+    def test_new_bars_are_appended(self):
+        from api.next_day import NextDayState
+
+        state = NextDayState.from_close("MSFT", self.close.iloc[:-5])
+        state = self.advance(state, self.close.iloc[-5:])
+        self.assertMatchesScaler(state, self.close)
+
+    def test_refetched_bars_replace_held_ones(self):
+        from api.next_day import NextDayState
+
+        state = NextDayState.from_close("MSFT", self.close)
+        revised = self.close.iloc[-3:].copy()
+        revised.iloc[-1] = self.close.max() + 10  # new high on a revised bar
+        state = self.advance(state, revised)
+        self.assertMatchesScaler(state, self.close.iloc[:-3].combine_first(revised))
+
+    def test_replacing_the_high_rescans(self):
+        from api.next_day import NextDayState
+
+        close = self.close.copy()
+        close.iloc[-1] = close.max() + 10
+        state = NextDayState.from_close("MSFT", close)
+        revised = close.iloc[-1:] - 20  # the partial bar was the high
+        state = self.advance(state, revised)
+        expected = close.copy()
+        expected.iloc[-1] -= 20
+        self.assertMatchesScaler(state, expected)
+
+    def test_evicting_the_low_rescans(self):
+        from api.next_day import NextDayState
+
+        close = self.close.copy()
+        close.iloc[0] = close.min() - 10
+        state = NextDayState.from_close("MSFT", close.iloc[:-5])
+        state = self.advance(state, close.iloc[-5:], cutoff=close.index[10])
+        self.assertMatchesScaler(state, close.iloc[10:])
+
+    def test_revised_close_invalidates_the_prediction(self):
+        from unittest import mock
+
+        import numpy as np
+
+        from api import next_day
+
+        model = mock.Mock()
+        model.predict.return_value = np.array([[0.5]], dtype="float32")
+        state = next_day.NextDayState.from_close("MSFT", self.close)
+        with (
+            mock.patch.object(next_day, "get_model", return_value=model),
+            mock.patch.object(next_day.registry, "model_hash", return_value="h"),
+            mock.patch.object(next_day, "_put_state") as put,
+        ):
+            next_day.predict_from_state(state, seq_length=100)
+            state = put.call_args.args[0]
+            next_day.predict_from_state(state, seq_length=100)
+            self.assertEqual(model.predict.call_count, 1)
+
+            revised = self.close.iloc[-1:] + 1
+            state = self.advance(state, revised)
+            next_day.predict_from_state(state, seq_length=100)
+            self.assertEqual(model.predict.call_count, 2)
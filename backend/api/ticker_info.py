@@ -0,0 +1,125 @@
+# api/ticker_info.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import TickerInfo
+from .providers import get_provider
+
+logger = logging.getLogger(__name__)
+
+# Fields of yfinance's .info that don't change day to day
+STATIC_FIELDS = [
+    "longName",
+    "shortName",
+    "sector",
+    "industry",
+    "currency",
+    "exchange",
+    "quoteType",
+    "country",
+    "website",
+]
+
+# ticker -> (refresh_after, info); refresh_after is a unix timestamp
+_memo: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_memo_lock = threading.Lock()
+_refreshing: set[str] = set()
+
+
+def get_info(ticker: str) -> dict:
+    """
+    Static metadata for ``ticker``.
+
+    Served from process memory, falling back to the ``TickerInfo`` table and
+    only then to the provider. Entries past their TTL are still returned
+    while a background thread fetches a fresh copy (stale-while-revalidate).
+    """
+    entry = _memo_get(ticker)
+    if entry is None:
+        entry = _load_from_db(ticker) or _fetch(ticker)
+
+    refresh_after, info = entry
+    if time.time() >= refresh_after:
+        _refresh_in_background(ticker)
+    return info
+
+
+def company_name(ticker: str) -> str:
+    return get_info(ticker).get("longName", "Unknown Company")
+
+
+def _memo_get(ticker):
+    with _memo_lock:
+        entry = _memo.get(ticker)
+        if entry is not None:
+            _memo.move_to_end(ticker)
+        return entry
+
+
+def _memo_put(ticker, entry):
+    with _memo_lock:
+        _memo[ticker] = entry
+        _memo.move_to_end(ticker)
+        while len(_memo) > settings.ML_TICKER_INFO_CACHE_SIZE:
+            _memo.popitem(last=False)
+
+
+def _load_from_db(ticker):
+    row = TickerInfo.objects.filter(pk=ticker).first()
+    if row is None:
+        return None
+    entry = (row.fetched_at.timestamp() + settings.ML_TICKER_INFO_TTL_SECONDS, row.info)
+    _memo_put(ticker, entry)
+    return entry
+
+
+def _fetch(ticker):
+    """
+    Blocking fetch. A failure keeps serving the info we already had (if
+    any) and is only retried after ML_TICKER_INFO_RETRY_SECONDS.
+    """
+    try:
+        raw = get_provider().ticker_info(ticker)
+    except Exception:
+        logger.warning("Could not fetch info for %s", ticker, exc_info=True)
+        previous = _memo_get(ticker)
+        info = previous[1] if previous is not None else {}
+        entry = (time.time() + settings.ML_TICKER_INFO_RETRY_SECONDS, info)
+        _memo_put(ticker, entry)
+        return entry
+
+    info = {key: raw[key] for key in STATIC_FIELDS if raw.get(key) is not None}
+    TickerInfo.objects.update_or_create(
+        ticker=ticker,
+        defaults={
+            "long_name": info.get("longName", ""),
+            "info": info,
+            "fetched_at": timezone.now(),
+        },
+    )
+    entry = (time.time() + settings.ML_TICKER_INFO_TTL_SECONDS, info)
+    _memo_put(ticker, entry)
+    return entry
+
+
+def _refresh_in_background(ticker):
+    with _memo_lock:
+        if ticker in _refreshing:
+            return
+        _refreshing.add(ticker)
+
+    def refresh():
+        try:
+            _fetch(ticker)
+        finally:
+            with _memo_lock:
+                _refreshing.discard(ticker)
+            close_old_connections()
+
+    threading.Thread(target=refresh, name=f"ticker-info-{ticker}", daemon=True).start()
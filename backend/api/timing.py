@@ -0,0 +1,255 @@
+# api/timing.py
+"""
+Per-phase timings for the prediction endpoints.
+
+Code marks phases with ``with phase("inference"):``. Inside a request
+wrapped by ``ServerTimingMiddleware`` each phase is reported in the
+``Server-Timing`` header and folded into per-process histograms served in
+Prometheus text format by ``metrics_view``. Outside a request (background
+jobs, management commands) ``phase`` only costs a context-variable lookup.
+
+Stdlib only, so it can sit in the CRUD import path.
+"""
+
+import hmac
+import os
+import resource
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+# Seconds; Prometheus' default buckets stretched to cover full backtests
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes():
+    """Current resident set size, or None where /proc isn't available."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return None
+
+
+def peak_rss_bytes():
+    """Peak resident set size (VmHWM) since start or the last reset."""
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # KiB on Linux
+
+
+def reset_peak_rss() -> bool:
+    """Restart VmHWM from the current RSS (Linux 4.0+); False if unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []  # [(name, seconds, peak RSS growth in bytes or None)]
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("timings", default=None)
+
+
+@contextmanager
+def phase(name):
+    """
+    Time the block and record how far peak RSS rose above the RSS at its
+    start. The high-water mark is per process, so a phase running alongside
+    another on a different thread may see its mark reset by that one.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    rss_before = rss_bytes()
+    peak_before = None if reset_peak_rss() else peak_rss_bytes()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        growth = None
+        if rss_before is not None:
+            peak = peak_rss_bytes()
+            if peak_before is not None and peak <= peak_before:
+                # No reset and no new lifetime high: the phase's own peak is
+                # unknown, the RSS it ended with is a lower bound
+                peak = rss_bytes()
+            growth = max(peak - rss_before, 0)
+        timings.phases.append((name, elapsed, growth))
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+
+
+class Metrics:
+    """Process-wide aggregates; each worker process exposes its own."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: dict[str, Histogram] = {}  # view -> total seconds
+        self.phases: dict[tuple, Histogram] = {}  # (view, phase) -> seconds
+        self.peak_growth: dict[tuple, int] = {}  # (view, phase) -> max bytes
+
+    def record(self, view, total, phases):
+        with self._lock:
+            self.requests.setdefault(view, Histogram()).observe(total)
+            for name, seconds, growth in phases:
+                key = (view, name)
+                self.phases.setdefault(key, Histogram()).observe(seconds)
+                if growth is not None:
+                    self.peak_growth[key] = max(self.peak_growth.get(key, 0), growth)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            lines += _histogram(
+                "ml_request_seconds",
+                "Wall time of instrumented prediction requests.",
+                {(("view", v),): h for v, h in self.requests.items()},
+            )
+            lines += _histogram(
+                "ml_phase_seconds",
+                "Wall time per phase of a prediction request.",
+                {(("view", v), ("phase", p)): h for (v, p), h in self.phases.items()},
+            )
+            lines += [
+                "# HELP ml_phase_peak_rss_growth_bytes_max Largest rise of peak "
+                "RSS above the RSS at the start of a phase.",
+                "# TYPE ml_phase_peak_rss_growth_bytes_max gauge",
+            ]
+            lines += [
+                f'ml_phase_peak_rss_growth_bytes_max{{view="{v}",phase="{p}"}} {b}'
+                for (v, p), b in sorted(self.peak_growth.items())
+            ]
+
+        rss = rss_bytes() or 0
+        # Lifetime peak: VmHWM is reset by phase(), ru_maxrss never is
+        peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024, rss)
+        lines += [
+            "# HELP process_resident_memory_bytes Resident memory size.",
+            "# TYPE process_resident_memory_bytes gauge",
+            f"process_resident_memory_bytes {rss}",
+            "# HELP process_peak_resident_memory_bytes Peak resident memory size.",
+            "# TYPE process_peak_resident_memory_bytes gauge",
+            f"process_peak_resident_memory_bytes {peak}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _histogram(name, help_text, series) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in sorted(series.items()):
+        label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+        cumulative = 0
+        for bound, count in zip([*BUCKETS, "+Inf"], histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{label_text}}} {histogram.total}")
+        lines.append(f"{name}_count{{{label_text}}} {cumulative}")
+    return lines
+
+
+metrics = Metrics()
+
+
+class ServerTimingMiddleware:
+    """
+    Collects ``phase`` timings for the request, adds a ``Server-Timing``
+    header and records them in ``metrics`` (only for requests that had
+    phases, so CRUD traffic doesn't add label cardinality).
+
+    Sync and async capable, so async views under ASGI don't get pushed
+    through a thread by the middleware chain.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    def _finish(self, request, response, timings):
+        if timings.phases:
+            total = time.perf_counter() - timings.started
+            match = request.resolver_match
+            view = match.url_name if match and match.url_name else "unknown"
+            metrics.record(view, total, timings.phases)
+            entries = [
+                f"{name};dur={seconds * 1000:.1f}"
+                for name, seconds, _ in timings.phases
+            ]
+            entries.append(f"total;dur={total * 1000:.1f}")
+            response["Server-Timing"] = ", ".join(entries)
+        return response
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape target for this worker process. Only for staff users
+    and scrapers sending ``ML_METRICS_TOKEN`` as a bearer token.
+    """
+    if not _may_scrape(request):
+        return HttpResponseForbidden("Forbidden\n", content_type="text/plain")
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def _may_scrape(request) -> bool:
+    token = settings.ML_METRICS_TOKEN
+    header = request.headers.get("Authorization", "")
+    if token and hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+        return True
+    user = getattr(request, "user", None)
+    return bool(user and user.is_active and user.is_staff)
@@ -1,16 +1,70 @@
 # api/urls.py
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
-from .views import StudentViewSet
-from .views import StockPredictionView  # ✅ Import the new view
-from .views import PredictNextDayAPIView
+from .lazy import lazy_view
+from .timing import metrics_view
+from .views import AccuracyLeaderboardView, StudentViewSet
 
 router = DefaultRouter()
 router.register(r"students", StudentViewSet, basename="student")
 
+# Stock prediction views are imported on first hit, keeping TensorFlow,
+# pandas and matplotlib out of workers that only serve the CRUD endpoints.
 urlpatterns = [
     path("", include(router.urls)),
     # ✅ Add the new path for the stock prediction view
-    path("predict-stock/", StockPredictionView.as_view(), name="predict-stock"),
-    path("predict/", PredictNextDayAPIView.as_view(), name="predict-next-day"),
+    path(
+        "predict-stock/",
+        lazy_view("api.ml_views.StockPredictionView"),
+        name="predict-stock",
+    ),
+    path(
+        "predict-stock/stream/",
+        lazy_view("api.ml_views.StockPredictionStreamView"),
+        name="predict-stock-stream",
+    ),
+    path(
+        "predict-stock/jobs/",
+        lazy_view("api.ml_views.PredictionJobView"),
+        name="prediction-jobs",
+    ),
+    path(
+        "predict-stock/jobs/<uuid:job_id>/",
+        lazy_view("api.ml_views.PredictionJobDetailView"),
+        name="prediction-job-detail",
+    ),
+    re_path(
+        r"^plots/(?P<run_id>[0-9a-f]{32})/(?P<kind>[a-z_]+)\.png$",
+        lazy_view("api.ml_views.prediction_plot", csrf_exempt=False),
+        name="prediction-plot",
+    ),
+    re_path(
+        r"^predictions/(?P<run_id>[0-9a-f]{32})/series/$",
+        lazy_view("api.ml_views.PredictionSeriesView"),
+        name="prediction-series",
+    ),
+    path(
+        "predict/",
+        lazy_view("api.ml_views.PredictNextDayAPIView"),
+        name="predict-next-day",
+    ),
+    # Same payload as predict/, as an async view for ASGI deployments
+    path(
+        "predict/async/",
+        lazy_view("api.ml_views.predict_next_day_async", is_async=True),
+        name="predict-next-day-async",
+    ),
+    # Prometheus text: request/phase histograms for this worker process
+    path("metrics/", metrics_view, name="metrics"),
+    # Plain table read, so routed eagerly like the CRUD views
+    path(
+        "predict/leaderboard/",
+        AccuracyLeaderboardView.as_view(),
+        name="accuracy-leaderboard",
+    ),
+    path(
+        "predict/batch/",
+        lazy_view("api.ml_views.BatchPredictNextDayAPIView"),
+        name="predict-next-day-batch",
+    ),
 ]
@@ -1,27 +1,19 @@
-from rest_framework import viewsets, filters
+from django.db import transaction
+from rest_framework import generics, status, viewsets, filters
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from students.models import Student
-from .serializers import StudentSerializer
-from api.pagination import SmallResultsSetPagination
+from .models import TickerAccuracy
+from .serializers import StudentSerializer, TickerAccuracySerializer
+from api.pagination import LeaderboardPagination, OptionalCursorPagination
 from api.filters import StudentFilter
+from api.search import IndexedSearchFilter, RankedOrderingFilter
 from api.permissions import IsOwnerOrReadOnly  # 👈 Import your custom permission
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
-from .serializers import TickerSerializer
-from django.conf import settings
-from .ml_utils import perform_prediction
-import warnings
-import os
-import yfinance as yf
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-from pathlib import Path
-from sklearn.preprocessing import MinMaxScaler
-from tensorflow.keras.models import load_model
-
-warnings.filterwarnings("ignore")
+
+# Stock prediction views live in api/ml_views.py and are imported lazily
+# by api/urls.py, so CRUD-only workers never load the ML stack.
 
 
 class StudentViewSet(viewsets.ModelViewSet):
@@ -32,7 +24,7 @@ class StudentViewSet(viewsets.ModelViewSet):
 
     queryset = Student.objects.all()
     serializer_class = StudentSerializer
-    pagination_class = SmallResultsSetPagination
+    pagination_class = OptionalCursorPagination  # ?pagination=cursor for keyset
 
     # --- Apply the stronger, object-level permission class ---
     permission_classes = [IsOwnerOrReadOnly]  # 👈 SECURITY FIX
@@ -40,13 +32,13 @@ class StudentViewSet(viewsets.ModelViewSet):
     # --- Full-featured filtering, search, and ordering ---
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        IndexedSearchFilter,  # ?search= through the search index, ranked
+        RankedOrderingFilter,
     ]
     filterset_class = StudentFilter
     search_fields = ["name", "student_id", "branch", "creator__username"]
     ordering_fields = ["created_at", "branch", "creator__username"]
-    ordering = ["-created_at"]
+    ordering = ["-created_at", "-id"]  # id breaks ties so pages are stable
 
     def get_queryset(self):
         """Optimized queryset to prefetch the creator for performance."""
@@ -65,103 +57,153 @@ class StudentViewSet(viewsets.ModelViewSet):
         """Securely assigns the creator on record creation."""
         serializer.save(creator=self.request.user)
 
+    # --- Bulk create / partial update / delete ---
+    # One validation pass, one transaction and a handful of queries per
+    # request instead of one round trip per student. Nothing is written
+    # unless every item is valid; errors come back as a list aligned with
+    # the request items ({} for the good ones), like DRF's many=True errors.
+
+    bulk_max_items = 10000
+    bulk_batch_size = 1000
+
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request):
+        """
+        POST a list of students to create them, PATCH a list of partial
+        students with their ``id`` to update them, or DELETE a list of ids.
+        """
+        if not request.user.is_authenticated:
+            self.permission_denied(request)
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"non_field_errors": ["Expected a non-empty list."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {
+                    "non_field_errors": [
+                        f"At most {self.bulk_max_items} items per request."
+                    ]
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-# backend/api/views.py
-
+        if request.method == "POST":
+            return self._bulk_create(items)
+        if request.method == "PATCH":
+            return self._bulk_update(items)
+        return self._bulk_delete(items)
 
-class StockPredictionView(APIView):
-    def post(self, request, *args, **kwargs):
-        serializer = TickerSerializer(data=request.data)
+    def _bulk_create(self, items):
+        serializer = self.get_serializer(data=items, many=True)
         if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        ticker = serializer.validated_data["ticker"]
-
-        try:
-            result = perform_prediction(ticker)
-
-            # Build URLs for each plot
-            plot_urls = {
-                key.replace("_path", "_url"): request.build_absolute_uri(
-                    f"{settings.MEDIA_URL}{path}"
-                )
-                for key, path in result["plots"].items()
-            }
-
-            response_data = {
-                "metrics": result["metrics"],
-                "plots": plot_urls,
-            }
-
-            return Response(response_data, status=status.HTTP_200_OK)
-
-        except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-
-class PredictNextDayAPIView(APIView):
-    def get(self, request):
-        ticker = request.GET.get("ticker", "MSFT").upper().strip()
-
-        seq_length = 100
-        model_path = os.path.join(
-            Path(settings.BASE_DIR).parent, "Resources", "stock_prediction_model.keras"
+            errors = serializer.errors
+            if isinstance(errors, dict):  # newer DRF only lists failing indexes
+                errors = [errors.get(i, {}) for i in range(len(items))]
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        students = [
+            Student(**attrs, creator=self.request.user)
+            for attrs in serializer.validated_data
+        ]
+        with transaction.atomic():
+            Student.objects.bulk_create(students, batch_size=self.bulk_batch_size)
+        return Response(
+            self.get_serializer(students, many=True).data,
+            status=status.HTTP_201_CREATED,
         )
 
-        if not os.path.exists(model_path):
-            return Response(
-                {"error": f"Model file not found at {model_path}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+    def _bulk_update(self, items):
+        ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+        students, errors = self._bulk_targets(ids)
+
+        # One serializer for all items; building its fields dominates otherwise
+        serializer = self.get_serializer(partial=True)
+        fields = set()
+        for item, student, error in zip(items, students, errors):
+            if student is None:
+                continue
+            serializer.instance = student
+            try:
+                attrs = serializer.run_validation(item)
+            except ValidationError as e:
+                error.update(e.detail)
+                continue
+            for name, value in attrs.items():
+                setattr(student, name, value)
+                fields.add(name)
+        if any(errors):
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        if fields:
+            with transaction.atomic():
+                Student.objects.bulk_update(
+                    students, sorted(fields), batch_size=self.bulk_batch_size
+                )
+        return Response(self.get_serializer(students, many=True).data)
+
+    def _bulk_delete(self, ids):
+        students, errors = self._bulk_targets(ids)
+        if any(errors):
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            Student.objects.filter(pk__in=[s.pk for s in students]).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def _bulk_targets(self, ids):
+        """
+        Students for ``ids`` (one query) and per-item errors: ids the user
+        can't see are "not found", ones they can see but may not change fail
+        the object permissions, exactly as on the single-item routes.
+        """
+        found = self.get_queryset().in_bulk([pk for pk in ids if type(pk) is int])
+        permissions = self.get_permissions()
+        students, errors = [], []
+        for pk in ids:
+            student = found.get(pk) if type(pk) is int else None
+            if student is None:
+                errors.append({"id": ["Not found."]})
+            elif not all(
+                p.has_object_permission(self.request, self, student)
+                for p in permissions
+            ):
+                student = None
+                errors.append({"id": [PermissionDenied.default_detail]})
+            else:
+                errors.append({})
+            students.append(student)
+        return students, errors
+
+
+class AccuracyLeaderboardView(generics.ListAPIView):
+    """
+    Precomputed backtest accuracy per ticker (``manage.py evaluate_universe``),
+    best first. A plain table read: the model is never touched.
 
-        try:
-            # --- 1) Download data ---
-            end = datetime.now()
-            start = end - timedelta(days=365 * 2)
-            df = yf.download(
-                ticker, start=start, end=end, auto_adjust=True, progress=False
-            )
+    ``?model_hash=`` selects a model, defaulting to the most recently
+    evaluated one; ``?ordering=`` sorts by rmse, mse, r2, ticker or as_of.
+    """
 
-            if df.empty or len(df) < seq_length:
-                return Response(
-                    {
-                        "error": f"Not enough data for {ticker} to form sequence of {seq_length} days."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+    serializer_class = TickerAccuracySerializer
+    pagination_class = LeaderboardPagination
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ["rmse", "mse", "r2", "ticker", "as_of"]
+    ordering = ["rmse", "ticker"]
 
-            # --- 2) Prepare sequence ---
-            df = df[["Close"]].dropna()
-            scaler = MinMaxScaler(feature_range=(0, 1))
-            scaled = scaler.fit_transform(df)
-            last_sequence = scaled[-seq_length:]
-            x_input = np.reshape(last_sequence, (1, seq_length, 1))
-
-            # --- 3) Load model + predict ---
-            model = load_model(model_path)
-            predicted_scaled = model.predict(x_input, verbose=0)
-            predicted_price = scaler.inverse_transform(predicted_scaled)[0][0]
-
-            # --- 4) Company info + prediction date ---
-            info = yf.Ticker(ticker).info
-            company_name = info.get("longName", "Unknown Company")
-            last_date = df.index[-1]
-            prediction_date = last_date + pd.tseries.offsets.BDay(1)
-
-            # --- 5) Return JSON ---
-            return Response(
-                {
-                    "ticker": ticker,
-                    "company_name": company_name,
-                    "predicted_price": round(float(predicted_price), 2),
-                    "prediction_date": prediction_date.strftime("%Y-%m-%d"),
-                    "last_close_price": round(df["Close"].iloc[-1], 2),
-                    "last_close_date": last_date.strftime("%Y-%m-%d"),
-                }
+    def get_queryset(self):
+        model_hash = self.request.query_params.get("model_hash")
+        if not model_hash:
+            model_hash = (
+                TickerAccuracy.objects.order_by("-evaluated_at")
+                .values_list("model_hash", flat=True)
+                .first()
             )
+        return TickerAccuracy.objects.filter(model_hash=model_hash)
 
-        except Exception as e:
-            return Response(
-                {"error": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+    def filter_queryset(self, queryset):
+        # Tickers are unique per model: a final tiebreak keeps pages stable
+        queryset = super().filter_queryset(queryset)
+        return queryset.order_by(*queryset.query.order_by, "ticker")
@@ -1,5 +1,5 @@
 import django_filters
-from .models import Article, Comment
+from .models import ARTICLE_STATUS, Article, Comment
 
 
 class ArticleFilter(django_filters.FilterSet):
@@ -10,10 +10,11 @@ class ArticleFilter(django_filters.FilterSet):
         field_name="creator__username", lookup_expr="icontains"
     )
     title = django_filters.CharFilter(field_name="title", lookup_expr="icontains")
+    status = django_filters.ChoiceFilter(choices=ARTICLE_STATUS)
 
     class Meta:
         model = Article
-        fields = ["username", "title"]
+        fields = ["username", "title", "status"]
 
 
 class CommentFilter(django_filters.FilterSet):
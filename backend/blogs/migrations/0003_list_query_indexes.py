@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (
+        ("blogs", "0002_created_at_id_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    )
+
+    operations = (
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="article_status_created_idx",
+            ),
+        ),
+    )
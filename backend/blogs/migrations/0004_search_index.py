@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:19
+# Search index DDL frozen from api.search.create_sql/drop_sql("blogs.Article", ...)
+
+from django.db import migrations
+
+from api.operations import RunSQLFor
+
+
+class Migration(migrations.Migration):
+    dependencies = (("blogs", "0003_list_query_indexes"),)
+
+    operations = (
+        RunSQLFor(
+            "postgresql",
+            sql=[
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+                "CREATE INDEX IF NOT EXISTS blogs_article_vector_idx ON \"blogs_article\" USING gin ((setweight(to_tsvector('english', coalesce(\"blogs_article\".\"title\", '')), 'A') || setweight(to_tsvector('english', coalesce(\"blogs_article\".\"content\", '')), 'B')))",
+                'CREATE INDEX IF NOT EXISTS blogs_article_trgm_idx ON "blogs_article" USING gin ((coalesce("blogs_article"."title", \'\')) gin_trgm_ops)',
+            ],
+            reverse_sql=[
+                "DROP INDEX IF EXISTS blogs_article_vector_idx",
+                "DROP INDEX IF EXISTS blogs_article_trgm_idx",
+            ],
+        ),
+        RunSQLFor(
+            "sqlite",
+            sql=[
+                "CREATE VIRTUAL TABLE blogs_article_search USING fts5(title, content, tokenize='trigram')",
+                "INSERT INTO blogs_article_search(rowid, title, content) SELECT t.id, t.title, t.content FROM blogs_article t",
+                "CREATE TRIGGER blogs_article_search_ai AFTER INSERT ON blogs_article BEGIN INSERT INTO blogs_article_search(rowid, title, content) VALUES (new.id, new.title, new.content); END",
+                "CREATE TRIGGER blogs_article_search_au AFTER UPDATE ON blogs_article BEGIN DELETE FROM blogs_article_search WHERE rowid = old.id; INSERT INTO blogs_article_search(rowid, title, content) VALUES (new.id, new.title, new.content); END",
+                "CREATE TRIGGER blogs_article_search_ad AFTER DELETE ON blogs_article BEGIN DELETE FROM blogs_article_search WHERE rowid = old.id; END",
+            ],
+            reverse_sql=[
+                "DROP TRIGGER IF EXISTS blogs_article_search_ai",
+                "DROP TRIGGER IF EXISTS blogs_article_search_au",
+                "DROP TRIGGER IF EXISTS blogs_article_search_ad",
+                "DROP TABLE IF EXISTS blogs_article_search",
+            ],
+        ),
+    )
@@ -22,6 +22,16 @@ class Article(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="articles"
     )
 
+    class Meta:
+        # Article list: newest first, optionally narrowed by ?status=
+        indexes = (
+            models.Index(fields=["-created_at", "-id"], name="article_created_idx"),
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="article_status_created_idx",
+            ),
+        )
+
     def __str__(self):
         return self.title
 
@@ -37,5 +47,14 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)  # <-- added
 
+    class Meta:
+        # Comments of one article, keyset-paginated on (-created_at, -id)
+        indexes = (
+            models.Index(
+                fields=["article", "-created_at", "-id"],
+                name="comment_article_created_idx",
+            ),
+        )
+
     def __str__(self):
         return f"Comment by {self.creator} on {self.article}"
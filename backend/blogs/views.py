@@ -10,6 +10,8 @@ from .filters import ArticleFilter, CommentFilter  # 👈 Import your custom fil
 
 
 from .permissions import IsOwnerOrReadOnly
+from api.pagination import OptionalCursorPagination
+from api.search import IndexedSearchFilter, RankedOrderingFilter
 
 
 class ArticleViewSet(viewsets.ModelViewSet):
@@ -21,16 +23,17 @@ class ArticleViewSet(viewsets.ModelViewSet):
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
     permission_classes = [IsOwnerOrReadOnly]
+    pagination_class = OptionalCursorPagination  # ?pagination=cursor for keyset
 
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        IndexedSearchFilter,  # ?search= through the search index, ranked
+        RankedOrderingFilter,
     ]
     filterset_class = ArticleFilter  # 👈 USE THE CUSTOM FILTER
     search_fields = ["title", "content"]
     ordering_fields = ["created_at", "title"]
-    ordering = ["-created_at"]
+    ordering = ["-created_at", "-id"]
 
     def get_queryset(self):
         return self.queryset.select_related("creator").prefetch_related(
@@ -50,11 +53,12 @@ class CommentViewSet(viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [IsOwnerOrReadOnly]
+    pagination_class = OptionalCursorPagination  # ?pagination=cursor for keyset
 
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = CommentFilter  # 👈 USE THE CUSTOM FILTER
     ordering_fields = ["created_at"]
-    ordering = ["-created_at"]
+    ordering = ["-created_at", "-id"]
 
     def get_queryset(self):
         # Filter comments for the given article_pk from URL
@@ -119,6 +119,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    # Server-Timing header + /api/v1/metrics/ for the prediction endpoints
+    "api.timing.ServerTimingMiddleware",
 ]
 
 if DEBUG:
@@ -265,3 +267,115 @@ MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# ==============================================================================
+# MACHINE LEARNING (stock prediction)
+# ==============================================================================
+
+ML_MODEL_PATH = Path(
+    os.getenv(
+        "ML_MODEL_PATH",
+        BASE_DIR.parent / "Resources" / "stock_prediction_model.keras",
+    )
+)
+ML_SEQUENCE_LENGTH = 100  # must match the window the model was trained on
+
+# "keras" runs ML_MODEL_PATH as is; "tflite" runs the ML_TFLITE_VARIANT
+# (float32, float16 or int8) written next to it by `manage.py convert_model`
+ML_INFERENCE_RUNTIME = os.getenv("ML_INFERENCE_RUNTIME", "keras")
+ML_TFLITE_VARIANT = os.getenv("ML_TFLITE_VARIANT", "float16")
+ML_TFLITE_THREADS = int(os.getenv("ML_TFLITE_THREADS", 1))  # interpreter threads
+
+# Optional local inference server (`manage.py serve_model`). When the socket
+# is set, workers send windows to it instead of loading the model themselves;
+# requests arriving within the batch window run as one batched predict.
+ML_INFERENCE_SOCKET = os.getenv("ML_INFERENCE_SOCKET", "")
+ML_INFERENCE_TIMEOUT_SECONDS = int(os.getenv("ML_INFERENCE_TIMEOUT_SECONDS", 30))
+ML_INFERENCE_BATCH_WINDOW_MS = int(os.getenv("ML_INFERENCE_BATCH_WINDOW_MS", 5))
+ML_INFERENCE_MAX_BATCH = int(os.getenv("ML_INFERENCE_MAX_BATCH", 1024))  # windows
+ML_TF_INTRA_OP_THREADS = int(os.getenv("ML_TF_INTRA_OP_THREADS", 0))  # 0 = TF default
+ML_TF_INTER_OP_THREADS = int(os.getenv("ML_TF_INTER_OP_THREADS", 0))
+# Threads running inference for the async (ASGI) views; bounds how many
+# predictions one worker computes at once while its event loop stays free
+ML_ASYNC_INFERENCE_THREADS = int(os.getenv("ML_ASYNC_INFERENCE_THREADS", 2))
+
+# Load + warm up the model when the worker boots instead of on the first request
+ML_PRELOAD_MODEL = os.getenv("ML_PRELOAD_MODEL", "false").strip().lower() == "true"
+
+# Where prices/metadata come from: "yfinance", "file" (offline fixtures in
+# ML_FIXTURES_DIR) or a dotted path to a MarketDataProvider subclass
+ML_MARKET_DATA_PROVIDER = os.getenv("ML_MARKET_DATA_PROVIDER", "yfinance")
+ML_FIXTURES_DIR = Path(os.getenv("ML_FIXTURES_DIR", BASE_DIR / "fixtures" / "prices"))
+# Concurrent provider requests within this window share one download
+ML_PROVIDER_BATCH_WINDOW_MS = int(os.getenv("ML_PROVIDER_BATCH_WINDOW_MS", 50))
+
+# Local on-disk data (price history etc.) shared by all workers on a host
+ML_DATA_DIR = Path(os.getenv("ML_DATA_DIR", BASE_DIR / "ml_data"))
+ML_PRICE_STORE_DIR = ML_DATA_DIR / "prices"
+# Don't ask the provider for new bars more often than this (per ticker)
+ML_PRICE_REFRESH_SECONDS = int(os.getenv("ML_PRICE_REFRESH_SECONDS", 15 * 60))
+# Windows fed to model.predict per call when backtesting a whole history
+ML_BACKTEST_CHUNK_SIZE = int(os.getenv("ML_BACKTEST_CHUNK_SIZE", 512))
+# Upper bound on tickers accepted by POST /api/v1/predict/batch/
+ML_BATCH_MAX_TICKERS = int(os.getenv("ML_BATCH_MAX_TICKERS", 500))
+# Longest ?horizon= (business days) the next-day endpoints will forecast
+ML_MAX_HORIZON = int(os.getenv("ML_MAX_HORIZON", 60))
+# Tickers whose rolling next-day state each worker keeps in memory (LRU)
+ML_NEXT_DAY_STATE_SIZE = int(os.getenv("ML_NEXT_DAY_STATE_SIZE", 1000))
+
+# Company metadata (yf.Ticker(...).info): served stale while refreshing
+ML_TICKER_INFO_TTL_SECONDS = int(
+    os.getenv("ML_TICKER_INFO_TTL_SECONDS", 7 * 24 * 60 * 60)
+)
+ML_TICKER_INFO_RETRY_SECONDS = 60  # after a failed fetch
+ML_TICKER_INFO_CACHE_SIZE = 10000  # entries kept in memory per worker
+
+# Tickers `manage.py evaluate_universe` backtests for the accuracy leaderboard
+ML_EVALUATION_UNIVERSE = [
+    t.strip().upper()
+    for t in os.getenv(
+        "ML_EVALUATION_UNIVERSE", "AAPL,MSFT,GOOGL,AMZN,NVDA,META,TSLA"
+    ).split(",")
+    if t.strip()
+]
+
+# Rendered plots and the prediction series behind them (ML_DATA_DIR/plots)
+# are evicted LRU beyond this many bytes
+ML_PLOT_STORE_MAX_BYTES = int(os.getenv("ML_PLOT_STORE_MAX_BYTES", 512 * 1024 * 1024))
+# Let the front proxy send plot files: "" (Django streams them),
+# "x-accel-redirect" (nginx: an `internal` location at ML_PLOT_ACCEL_PREFIX
+# aliased to ML_DATA_DIR/plots/) or "x-sendfile" (Apache/lighttpd)
+ML_PLOT_SENDFILE = os.getenv("ML_PLOT_SENDFILE", "")
+ML_PLOT_ACCEL_PREFIX = os.getenv("ML_PLOT_ACCEL_PREFIX", "/internal/plots/")
+
+# Idle interval between heartbeat events on POST /api/v1/predict-stock/stream/
+ML_STREAM_HEARTBEAT_SECONDS = int(os.getenv("ML_STREAM_HEARTBEAT_SECONDS", 15))
+
+# GET /api/v1/metrics/ answers staff sessions and requests carrying
+# "Authorization: Bearer <ML_METRICS_TOKEN>" (set it for Prometheus)
+ML_METRICS_TOKEN = os.getenv("ML_METRICS_TOKEN", "")
+
+# Background prediction jobs (POST /api/v1/predict-stock/jobs/)
+ML_JOB_WORKERS = int(os.getenv("ML_JOB_WORKERS", 2))  # pool processes per web worker
+ML_JOB_TIMEOUT_SECONDS = int(os.getenv("ML_JOB_TIMEOUT_SECONDS", 10 * 60))
+
+# ==============================================================================
+# CACHES
+# ==============================================================================
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Full-history prediction results (metrics + run id). LocMem is an
+    # LRU per worker; point it at a shared backend to share across workers.
+    "predictions": {
+        "BACKEND": os.getenv(
+            "ML_RESULT_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("ML_RESULT_CACHE_LOCATION", "predictions"),
+        "TIMEOUT": None,  # keys change when data or model change
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("ML_RESULT_CACHE_SIZE", 1000))},
+    },
+}
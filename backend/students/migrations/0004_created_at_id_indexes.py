@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("students", "0003_student_created_at"),)
+
+    operations = (
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="student_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["creator", "-created_at", "-id"],
+                name="student_creator_created_idx",
+            ),
+        ),
+    )
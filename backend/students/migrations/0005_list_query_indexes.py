@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("students", "0004_created_at_id_indexes"),)
+
+    operations = (
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(fields=["branch"], name="student_branch_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["creator", "branch"], name="student_creator_branch_idx"
+            ),
+        ),
+    )
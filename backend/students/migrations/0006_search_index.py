@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:18
+# Search index DDL frozen from api.search.create_sql/drop_sql("students.Student", ...)
+
+from django.db import migrations
+
+from api.operations import RunSQLFor
+
+
+class Migration(migrations.Migration):
+    dependencies = (("students", "0005_list_query_indexes"),)
+
+    operations = (
+        RunSQLFor(
+            "postgresql",
+            sql=[
+                "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+                "CREATE INDEX IF NOT EXISTS students_student_vector_idx ON \"students_student\" USING gin ((setweight(to_tsvector('simple', coalesce(\"students_student\".\"name\", '')), 'A') || setweight(to_tsvector('simple', coalesce(\"students_student\".\"student_id\", '')), 'B') || setweight(to_tsvector('simple', coalesce(\"students_student\".\"branch\", '')), 'C')))",
+                'CREATE INDEX IF NOT EXISTS students_student_trgm_idx ON "students_student" USING gin ((coalesce("students_student"."name", \'\') || \' \' || coalesce("students_student"."student_id", \'\') || \' \' || coalesce("students_student"."branch", \'\')) gin_trgm_ops)',
+                'CREATE INDEX IF NOT EXISTS students_userprofile_username_trgm_idx ON "students_userprofile" USING gin (username gin_trgm_ops)',
+            ],
+            reverse_sql=[
+                "DROP INDEX IF EXISTS students_student_vector_idx",
+                "DROP INDEX IF EXISTS students_student_trgm_idx",
+                "DROP INDEX IF EXISTS students_userprofile_username_trgm_idx",
+            ],
+        ),
+        RunSQLFor(
+            "sqlite",
+            sql=[
+                "CREATE VIRTUAL TABLE students_student_search USING fts5(name, student_id, branch, username, tokenize='trigram')",
+                "INSERT INTO students_student_search(rowid, name, student_id, branch, username) SELECT t.id, t.name, t.student_id, t.branch, (SELECT username FROM students_userprofile WHERE id = t.creator_id) FROM students_student t",
+                "CREATE TRIGGER students_student_search_ai AFTER INSERT ON students_student BEGIN INSERT INTO students_student_search(rowid, name, student_id, branch, username) VALUES (new.id, new.name, new.student_id, new.branch, (SELECT username FROM students_userprofile WHERE id = new.creator_id)); END",
+                "CREATE TRIGGER students_student_search_au AFTER UPDATE ON students_student BEGIN DELETE FROM students_student_search WHERE rowid = old.id; INSERT INTO students_student_search(rowid, name, student_id, branch, username) VALUES (new.id, new.name, new.student_id, new.branch, (SELECT username FROM students_userprofile WHERE id = new.creator_id)); END",
+                "CREATE TRIGGER students_student_search_ad AFTER DELETE ON students_student BEGIN DELETE FROM students_student_search WHERE rowid = old.id; END",
+                "CREATE TRIGGER students_student_search_user_au AFTER UPDATE OF username ON students_userprofile BEGIN UPDATE students_student_search SET username = new.username WHERE rowid IN (SELECT id FROM students_student WHERE creator_id = new.id); END",
+            ],
+            reverse_sql=[
+                "DROP TRIGGER IF EXISTS students_student_search_ai",
+                "DROP TRIGGER IF EXISTS students_student_search_au",
+                "DROP TRIGGER IF EXISTS students_student_search_ad",
+                "DROP TRIGGER IF EXISTS students_student_search_user_au",
+                "DROP TABLE IF EXISTS students_student_search",
+            ],
+        ),
+    )
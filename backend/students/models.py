@@ -29,5 +29,20 @@ class Student(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # StudentViewSet lists everything (staff) or one creator's rows,
+        # ordered by (-created_at, -id) by default or ?ordering=branch
+        indexes = (
+            models.Index(fields=["-created_at", "-id"], name="student_created_idx"),
+            models.Index(
+                fields=["creator", "-created_at", "-id"],
+                name="student_creator_created_idx",
+            ),
+            models.Index(fields=["branch"], name="student_branch_idx"),
+            models.Index(
+                fields=["creator", "branch"], name="student_creator_branch_idx"
+            ),
+        )
+
     def __str__(self):
         return self.name